@@ -7,5 +7,6 @@ setup(
     package_dir={"": "src"},  # Map the root package to the src directory
     install_requires=[
         "pygame>=2.6.1",  # Add other dependencies here
+        "numpy>=1.24",
     ],
 )
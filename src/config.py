@@ -31,6 +31,14 @@ class Config:
             self.grid_color = (200, 200, 200)
             self.grid_resolution = 5
             self.debug = False
+            # Planning
+            self.trace_level = "full"  # How much intermediate state planners yield: "none", "sampled" or "full"
+            self.trace_interval = 1  # Steps between yields with the "sampled" trace level
+            self.show_potential_heatmap = True  # Draw the precomputed field of grid potential field planners
+            self.heatmap_alpha = 120
+            # Sensors
+            self.sensor_cache_size = 4096  # Readings kept per sensor, by position
+            self.sensor_rescan_interval = 2.0  # Seconds between checks of the sensor import screen for changed plugin files
 
 
 config_instance = Config()
@@ -2,10 +2,15 @@ from .environment import Environment
 from .motion_planner import MotionPlanner
 from . import algorithms
 from . import sensors  # Import the new sensors module
+from .batch_planning import BatchResult, plan_batch
+from .multi_agent import MultiAgentPotentialField
 
 __all__ = [
     "Environment",
     "MotionPlanner",
     "algorithms",
     "sensors",
+    "BatchResult",
+    "plan_batch",
+    "MultiAgentPotentialField",
 ]
\ No newline at end of file
@@ -1,4 +1,11 @@
-from .potential_field import PotentialFieldPlanner as Potential_Field, BrushfireWithPathPlanner as Brushfire_PathPlanner
+from .bidirectional import BidirectionalBFSPlanner as Bidirectional_Breadth_First_Search, \
+    BidirectionalDijkstraPlanner as Bidirectional_Dijkstra, BidirectionalAStarPlanner as Bidirectional_AStar
+from .hierarchical import HierarchicalPlanner as Hierarchical_AStar
+from .incremental import DStarLitePlanner as D_Star_Lite
+from .jump_point_search import JumpPointSearchPlanner as Jump_Point_Search
+from .landmarks import ALTPlanner as ALT_AStar
+from .potential_field import PotentialFieldPlanner as Potential_Field, \
+    GridPotentialFieldPlanner as Potential_Field_Grid, BrushfireWithPathPlanner as Brushfire_PathPlanner
 from .random_walk import RandomWalkPlanner as Random_Walk
 from .search_algorithms import BreadthFirstSearchPlanner as Breadth_First_Search, \
     DepthFirstSearchPlanner as Depth_First_Search, DijkstraPlanner as Dijkstra, AStarPlanner as AStar
@@ -0,0 +1,202 @@
+import heapq
+import math
+from array import array
+
+from src.core.environment import Environment
+from src.core.motion_planner import TRACE_NONE, MotionPlanner
+from src.utils.grid import manhattan, new_parents, reconstruct_path, to_index, to_position
+
+# Generators in this module yield (path, step, trees). `trees` is a (start_tree, goal_tree) pair
+# holding the cells each search added to its tree since the previous yield, so a consumer can
+# grow both trees incrementally without the planner copying them on every step.
+
+
+def join_paths(forward_parents, forward_end, backward_parents, backward_end, width):
+    """Joins the start-side branch ending at `forward_end` with the goal-side branch ending at `backward_end`."""
+    path = reconstruct_path(forward_parents, forward_end, width)
+    backward = reconstruct_path(backward_parents, backward_end, width)
+    backward.reverse()
+    return path + backward
+
+
+class BidirectionalBFSPlanner(MotionPlanner):
+    def __init__(self, sensor=None):
+        pass
+
+    def plan(self, environment: Environment) -> (list, int, tuple):
+        if not environment.start or not environment.goal:
+            return None, 0
+
+        width, height = environment.width, environment.height
+        blocked = environment.occupancy.tobytes()
+        start = to_index(environment.start, width)
+        goal = to_index(environment.goal, width)
+        if start == goal:
+            yield [environment.start], 1, ([environment.start], [])
+            return [environment.start], 1
+
+        distances = (array('i', [-1]) * (width * height), array('i', [-1]) * (width * height))
+        parents = (new_parents(width * height), new_parents(width * height))
+        distances[0][start] = 0
+        distances[1][goal] = 0
+        frontiers = [[start], [goal]]
+        best = math.inf
+        meeting = None
+        step = 0
+        trees = ([], [])
+        traces = self.traces
+        keep_trees = self.trace_level != TRACE_NONE
+
+        while frontiers[0] and frontiers[1] and meeting is None:
+            # Grow the smaller frontier by one whole level
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            other = 1 - side
+            next_frontier = []
+
+            for current in frontiers[side]:
+                step += 1
+                if keep_trees:
+                    trees[side].append(to_position(current, width))
+                    if traces(step):
+                        yield reconstruct_path(parents[side], current, width), step, trees
+                        trees = ([], [])
+
+                y, x = divmod(current, width)
+                for next_x, next_y in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)):
+                    if not (0 <= next_x < width and 0 <= next_y < height):
+                        continue
+                    neighbor = next_y * width + next_x
+                    if blocked[neighbor]:
+                        continue
+                    if distances[other][neighbor] >= 0:
+                        candidate = distances[side][current] + 1 + distances[other][neighbor]
+                        if candidate < best:
+                            best = candidate
+                            meeting = (current, neighbor) if side == 0 else (neighbor, current)
+                    if distances[side][neighbor] < 0:
+                        distances[side][neighbor] = distances[side][current] + 1
+                        parents[side][neighbor] = current
+                        next_frontier.append(neighbor)
+
+            # The best meeting found while finishing the first level that touches the other tree is optimal
+            frontiers[side] = next_frontier
+
+        if meeting is None:
+            return None, step  # No path found
+
+        path = join_paths(parents[0], meeting[0], parents[1], meeting[1], width)
+        yield path, step, trees
+        return path, step
+
+
+class BidirectionalDijkstraPlanner(MotionPlanner):
+    def __init__(self, sensor=None):
+        pass
+
+    def cell_costs(self, environment: Environment):
+        """Returns the flat list of cell entry costs, or None for uniform cost 1."""
+        return environment.costs.ravel().tolist() if environment.costs is not None else None
+
+    def potential(self, environment: Environment):
+        """
+        Returns a function mapping a flat cell index to the forward search potential, or None.
+
+        The goal-side search uses the negated potential, so both searches see the same reduced
+        edge costs and the usual bidirectional Dijkstra stopping rule stays valid.
+        """
+        return None
+
+    def plan(self, environment: Environment) -> (list, int, tuple):
+        if not environment.start or not environment.goal:
+            return None, 0
+
+        width, height = environment.width, environment.height
+        blocked = environment.occupancy.tobytes()
+        costs = self.cell_costs(environment)
+        potential = self.potential(environment) or (lambda index: 0)
+        start = to_index(environment.start, width)
+        goal = to_index(environment.goal, width)
+        if start == goal:
+            yield [environment.start], 1, ([environment.start], [])
+            return [environment.start], 1
+
+        distances = ([math.inf] * (width * height), [math.inf] * (width * height))
+        parents = (new_parents(width * height), new_parents(width * height))
+        settled = (bytearray(width * height), bytearray(width * height))
+        distances[0][start] = 0
+        distances[1][goal] = 0
+        heaps = ([(potential(start), start)], [(-potential(goal), goal)])
+        signs = (1, -1)
+        best = math.inf
+        meeting = None
+        step = 0
+        trees = ([], [])
+        traces = self.traces
+        keep_trees = self.trace_level != TRACE_NONE
+
+        while heaps[0] and heaps[1]:
+            # Stop once no unexplored route can beat the best meeting found so far
+            if heaps[0][0][0] + heaps[1][0][0] >= best:
+                break
+            side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            other = 1 - side
+            _, current = heapq.heappop(heaps[side])
+            if settled[side][current]:
+                continue  # Stale entry
+            settled[side][current] = 1
+            step += 1
+            if keep_trees:
+                trees[side].append(to_position(current, width))
+                if traces(step):
+                    yield reconstruct_path(parents[side], current, width), step, trees
+                    trees = ([], [])
+
+            current_distance = distances[side][current]
+            y, x = divmod(current, width)
+            for next_x, next_y in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)):
+                if not (0 <= next_x < width and 0 <= next_y < height):
+                    continue
+                neighbor = next_y * width + next_x
+                if blocked[neighbor]:
+                    continue
+                # Edges cost the entry cost of the cell they lead into, which for the goal-side
+                # search (walking edges backwards) is the cell being expanded
+                entered = neighbor if side == 0 else current
+                new_distance = current_distance + (costs[entered] if costs is not None else 1)
+
+                candidate = new_distance + distances[other][neighbor]
+                if candidate < best:
+                    best = candidate
+                    meeting = (current, neighbor) if side == 0 else (neighbor, current)
+                if new_distance < distances[side][neighbor]:
+                    distances[side][neighbor] = new_distance
+                    parents[side][neighbor] = current
+                    heapq.heappush(heaps[side], (new_distance + signs[side] * potential(neighbor), neighbor))
+
+        if meeting is None:
+            return None, step  # No path found
+
+        path = join_paths(parents[0], meeting[0], parents[1], meeting[1], width)
+        yield path, step, trees
+        return path, step
+
+
+class BidirectionalAStarPlanner(BidirectionalDijkstraPlanner):
+    def __init__(self, sensor=None):
+        super().__init__(sensor)
+
+    def cell_costs(self, environment: Environment):
+        # Uniform step cost, like AStarPlanner
+        return None
+
+    def potential(self, environment: Environment):
+        # Average of the forward and backward heuristics, which keeps both searches consistent
+        width = environment.width
+        start, goal = environment.start, environment.goal
+        heuristic = manhattan
+
+        def average_potential(index):
+            cell = to_position(index, width)
+            return (heuristic(cell, goal) - heuristic(cell, start)) / 2
+
+        return average_potential
@@ -22,13 +22,14 @@ class Bug0Planner(MotionPlanner):
 
         while current != goal:
             step += 1
-            yield path, step
+            if self.traces(step):
+                yield path, step
 
             direction_to_goal = (goal[0] - current[0], goal[1] - current[1])
             next_step_towards_goal = (
             current[0] + self.sign(direction_to_goal[0]), current[1] + self.sign(direction_to_goal[1]))
 
-            sensor_data = self.sensor.sense(environment, current)
+            sensor_data = self.sensor.sense_obstacles(environment, current)  # Sense once per step
             obstacle_ahead = self.is_obstacle_at(next_step_towards_goal, sensor_data)
 
             if not on_boundary and obstacle_ahead:
@@ -49,6 +50,8 @@ class Bug0Planner(MotionPlanner):
                         break
                 if not moved:
                     print("Bug 0: Stuck while boundary following.")
+                    if not self.traces(step):
+                        yield path, step  # Untraced final state
                     return path, step
                 # Check if can move towards goal again
                 if not self.is_obstacle_at(next_step_towards_goal, sensor_data):
@@ -60,12 +63,18 @@ class Bug0Planner(MotionPlanner):
                 path.append(current)
             else:
                 print("Bug 0: Blocked while moving towards goal but should be on boundary.")  # Should not happen
+                if not self.traces(step):
+                    yield path, step  # Untraced final state
                 return path, step
 
             if step > 2000:  # Safety break
                 print("Bug 0: Max steps reached.")
+                if not self.traces(step):
+                    yield path, step  # Untraced final state
                 return path, step
 
+        if not self.traces(step):
+            yield path, step  # Untraced final state
         return path, step
 
     def sign(self, n):
@@ -74,11 +83,8 @@ class Bug0Planner(MotionPlanner):
         return 0
 
     def is_obstacle_at(self, position, sensor_data):
-        if sensor_data and "obstacles_in_range" in sensor_data:
-            for obs in sensor_data["obstacles_in_range"]:
-                if round(obs[0]) == round(position[0]) and round(obs[1]) == round(position[1]):
-                    return True
-        return False
+        # sensor_data is the obstacle lookup from SensorModel.sense_obstacles
+        return (round(position[0]), round(position[1])) in sensor_data
 
 
 class Bug1Planner(MotionPlanner):
@@ -99,13 +105,14 @@ class Bug1Planner(MotionPlanner):
 
         while current != goal:
             step += 1
-            yield path, step
+            if self.traces(step):
+                yield path, step
 
             direction_to_goal = (goal[0] - current[0], goal[1] - current[1])
             next_step_towards_goal = (
             current[0] + self.sign(direction_to_goal[0]), current[1] + self.sign(direction_to_goal[1]))
 
-            sensor_data = self.sensor.sense(environment, current)
+            sensor_data = self.sensor.sense_obstacles(environment, current)  # Sense once per step
             obstacle_ahead = self.is_obstacle_at(next_step_towards_goal, sensor_data)
 
             if not on_boundary and obstacle_ahead:
@@ -127,6 +134,8 @@ class Bug1Planner(MotionPlanner):
                         break
                 if not moved:
                     print("Bug 1: Stuck while boundary following.")
+                    if not self.traces(step):
+                        yield path, step  # Untraced final state
                     return path, step
 
                 # Check leave condition (simplified: can move towards goal and closer to goal than hit_point)
@@ -142,8 +151,12 @@ class Bug1Planner(MotionPlanner):
 
             if step > 2000:  # Safety break
                 print("Bug 1: Max steps reached.")
+                if not self.traces(step):
+                    yield path, step  # Untraced final state
                 return path, step
 
+        if not self.traces(step):
+            yield path, step  # Untraced final state
         return path, step
 
     def sign(self, n):
@@ -152,11 +165,8 @@ class Bug1Planner(MotionPlanner):
         return 0
 
     def is_obstacle_at(self, position, sensor_data):
-        if sensor_data and "obstacles_in_range" in sensor_data:
-            for obs in sensor_data["obstacles_in_range"]:
-                if round(obs[0]) == round(position[0]) and round(obs[1]) == round(position[1]):
-                    return True
-        return False
+        # sensor_data is the obstacle lookup from SensorModel.sense_obstacles
+        return (round(position[0]), round(position[1])) in sensor_data
 
     def calculate_distance(self, p1, p2):
         return math.sqrt((p1[0] - p2[0]) ** 2 + (p1[1] - p2[1]) ** 2)
@@ -184,7 +194,10 @@ class Bug2Planner(MotionPlanner):
 
         while current != goal:
             step += 1
-            yield path, step
+            if self.traces(step):
+                yield path, step
+
+            obstacles = self.sensor.sense_obstacles(environment, current)  # Sense once per step
 
             if self.mode == "goal_seek":
                 # Move towards the goal
@@ -201,16 +214,8 @@ class Bug2Planner(MotionPlanner):
                 next_x = round(current[0] + move_x * self.step_size)
                 next_y = round(current[1] + move_y * self.step_size)
 
-                # Check for obstacles using the sensor
-                sensor_data = self.sensor.sense(environment, current)
-                obstacle_ahead = False
-                if sensor_data and "obstacles_in_range" in sensor_data:
-                    # Check if the immediate next cell is occupied
-                    potential_obstacle = (next_x, next_y)
-                    for obs in sensor_data["obstacles_in_range"]:
-                        if self.are_same_location(obs, potential_obstacle):
-                            obstacle_ahead = True
-                            break
+                # Check if the immediate next cell is occupied, using the sensor
+                obstacle_ahead = (next_x, next_y) in obstacles
 
                 if obstacle_ahead:
                     self.mode = "boundary_follow"
@@ -240,13 +245,7 @@ class Bug2Planner(MotionPlanner):
                     potential_position = (next_x, next_y)
 
                     # Check if the potential position is valid and not an obstacle
-                    sensor_data = self.sensor.sense(environment, current)
-                    is_obstacle = False
-                    if sensor_data and "obstacles_in_range" in sensor_data:
-                        for obs in sensor_data["obstacles_in_range"]:
-                            if self.are_same_location(obs, potential_position):
-                                is_obstacle = True
-                                break
+                    is_obstacle = potential_position in obstacles
 
                     if environment.is_valid(next_x, next_y) and not is_obstacle:
                         current = potential_position
@@ -256,6 +255,8 @@ class Bug2Planner(MotionPlanner):
 
                 if not moved:
                     print("Stuck during boundary following!")
+                    if not self.traces(step):
+                        yield path, step  # Untraced final state
                     return path, step  # Or handle getting stuck differently
 
                 # Check for leave condition
@@ -271,16 +272,17 @@ class Bug2Planner(MotionPlanner):
 
             if step > 2000:  # Safety break
                 print("Max steps reached, possible infinite loop.")
+                if not self.traces(step):
+                    yield path, step  # Untraced final state
                 return path, step
 
+        if not self.traces(step):
+            yield path, step  # Untraced final state
         return path, step
 
     def calculate_distance(self, point1, point2):
         return math.sqrt((point1[0] - point2[0]) ** 2 + (point1[1] - point2[1]) ** 2)
 
-    def are_same_location(self, p1, p2):
-        return round(p1[0]) == round(p2[0]) and round(p1[1]) == round(p2[1])
-
     def is_on_m_line(self, current, hit_point, goal):
         # Simplified check if current is "beyond" the hit point towards the goal
         # This needs to be more robust for complex scenarios
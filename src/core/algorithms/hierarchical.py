@@ -0,0 +1,369 @@
+import heapq
+from collections import deque
+
+from src.core.environment import Environment
+from src.core.motion_planner import SearchPlanner
+
+
+def local_adjacency(block, block_width, block_height):
+    """
+    Lists the free 4-connected neighbours of every free cell of a cluster.
+
+    Args:
+        block: Bytes of the cluster's occupancy, row-major, non-zero for obstacles.
+        block_width: Width of the cluster.
+        block_height: Height of the cluster.
+
+    Returns:
+        A list indexed by local flat index; obstacle cells get an empty list.
+    """
+    adjacency = [[] for _ in range(block_width * block_height)]
+    for index in range(block_width * block_height):
+        if block[index]:
+            continue
+        y, x = divmod(index, block_width)
+        if x + 1 < block_width and not block[index + 1]:
+            adjacency[index].append(index + 1)
+            adjacency[index + 1].append(index)
+        if y + 1 < block_height and not block[index + block_width]:
+            adjacency[index].append(index + block_width)
+            adjacency[index + block_width].append(index)
+    return adjacency
+
+
+def local_bfs(adjacency, source, parents=None, target=None):
+    """
+    BFS inside one cluster.
+
+    Args:
+        adjacency: Output of local_adjacency for the cluster.
+        source: Local flat index to search from.
+        parents: Optional list filled with each cell's parent (local flat index, -1 for none).
+        target: Optional local flat index; the search stops as soon as it is reached.
+
+    Returns:
+        A list of hop distances per local cell, -1 where unreachable.
+    """
+    distances = [-1] * len(adjacency)
+    distances[source] = 0
+    queue = deque([source])
+    while queue:
+        current = queue.popleft()
+        if current == target:
+            break
+        next_distance = distances[current] + 1
+        for neighbor in adjacency[current]:
+            if distances[neighbor] < 0:
+                distances[neighbor] = next_distance
+                if parents is not None:
+                    parents[neighbor] = current
+                queue.append(neighbor)
+    return distances
+
+
+def local_components(adjacency, block):
+    """
+    Labels the connected free regions of a cluster.
+
+    Args:
+        adjacency: Output of local_adjacency for the cluster.
+        block: Bytes of the cluster's occupancy, as passed to local_adjacency.
+
+    Returns:
+        A list of region labels (0, 1, ...) per local cell, -1 for obstacle cells.
+    """
+    labels = [-1] * len(adjacency)
+    label = 0
+    for seed in range(len(adjacency)):
+        if block[seed] or labels[seed] >= 0:
+            continue
+        labels[seed] = label
+        stack = [seed]
+        while stack:
+            for neighbor in adjacency[stack.pop()]:
+                if labels[neighbor] < 0:
+                    labels[neighbor] = label
+                    stack.append(neighbor)
+        label += 1
+    return labels
+
+
+class AbstractGraph:
+    """
+    Cluster-level graph used by HierarchicalPlanner (HPA*).
+
+    The grid is split into square clusters. Wherever two neighbouring clusters share a run of
+    free cells along their border, a transition links them, and the cells on both sides become
+    abstract nodes. Runs joining the same pair of connected regions of the two clusters share
+    one transition, in the middle of the longest of them, which keeps the graph small on
+    cluttered maps without losing any connection. Inside each cluster the abstract nodes are
+    connected with their exact in-cluster distances.
+
+    The graph listens to its environment and only marks the clusters touched by an edit as
+    dirty; they are rebuilt, together with neighbours whose nodes changed, on the next query.
+    """
+
+    def __init__(self, environment: Environment, cluster_size=32):
+        self.environment = environment
+        self.cluster_size = cluster_size
+        self.width = None
+        self.height = None
+        self.entrances = {}  # (cluster_a, cluster_b) -> list of (cell_a, cell_b) transitions
+        self.transitions = {}  # node -> set of nodes across a cluster border
+        self.cluster_nodes = {}  # cluster -> set of abstract nodes
+        self.intra_edges = {}  # cluster -> {node: {node: distance}}
+        self.blocks = {}  # cluster -> (adjacency, x0, y0, block_width, region labels), built on demand
+        self.dirty_clusters = set()
+        self.needs_full_rebuild = True
+        environment.add_change_listener(self.on_environment_changed)
+
+    def on_environment_changed(self, cells):
+        if cells is None:
+            self.needs_full_rebuild = True
+            return
+        for x, y in cells:
+            self.dirty_clusters.add(self.cluster_of((x, y)))
+
+    def cluster_of(self, cell):
+        return cell[0] // self.cluster_size, cell[1] // self.cluster_size
+
+    def cluster_bounds(self, cluster):
+        x0, y0 = cluster[0] * self.cluster_size, cluster[1] * self.cluster_size
+        return x0, y0, min(x0 + self.cluster_size, self.width), min(y0 + self.cluster_size, self.height)
+
+    def cluster_neighbors(self, cluster):
+        columns = -(-self.width // self.cluster_size)
+        rows = -(-self.height // self.cluster_size)
+        cx, cy = cluster
+        for neighbor in ((cx + 1, cy), (cx - 1, cy), (cx, cy + 1), (cx, cy - 1)):
+            if 0 <= neighbor[0] < columns and 0 <= neighbor[1] < rows:
+                yield neighbor
+
+    def refresh(self):
+        """Brings the graph up to date with the environment, rebuilding only what is stale."""
+        environment = self.environment
+        if (environment.width, environment.height) != (self.width, self.height):
+            self.needs_full_rebuild = True
+
+        if self.needs_full_rebuild:
+            self.width, self.height = environment.width, environment.height
+            self.entrances, self.transitions, self.cluster_nodes, self.intra_edges = {}, {}, {}, {}
+            self.blocks = {}
+            columns = -(-self.width // self.cluster_size)
+            rows = -(-self.height // self.cluster_size)
+            self.dirty_clusters = {(cx, cy) for cx in range(columns) for cy in range(rows)}
+            self.needs_full_rebuild = False
+
+        if not self.dirty_clusters:
+            return
+
+        dirty, self.dirty_clusters = self.dirty_clusters, set()
+        for cluster in dirty:
+            self.blocks.pop(cluster, None)
+        borders = {tuple(sorted((cluster, neighbor))) for cluster in dirty for neighbor in self.cluster_neighbors(cluster)}
+        for border in borders:
+            self.rebuild_border(border)
+
+        affected = set(dirty)
+        for cluster_a, cluster_b in borders:
+            affected.update((cluster_a, cluster_b))
+        for cluster in affected:
+            nodes = set()
+            for neighbor in self.cluster_neighbors(cluster):
+                border = tuple(sorted((cluster, neighbor)))
+                for cell_a, cell_b in self.entrances.get(border, []):
+                    nodes.add(cell_a if self.cluster_of(cell_a) == cluster else cell_b)
+            # Neighbours only need new intra-cluster distances if their set of nodes changed
+            if cluster in dirty or nodes != self.cluster_nodes.get(cluster):
+                self.cluster_nodes[cluster] = nodes
+                self.rebuild_intra_edges(cluster)
+
+    def rebuild_border(self, border):
+        for cell_a, cell_b in self.entrances.pop(border, []):
+            self.transitions.get(cell_a, set()).discard(cell_b)
+            self.transitions.get(cell_b, set()).discard(cell_a)
+
+        occupancy = self.environment.occupancy
+        cluster_a, cluster_b = border
+        ax0, ay0, ax1, ay1 = self.cluster_bounds(cluster_a)
+        if cluster_a[0] != cluster_b[0]:
+            # Vertical border between horizontally adjacent clusters
+            pairs = [((ax1 - 1, y), (ax1, y)) for y in range(ay0, ay1)]
+            open_pairs = ((occupancy[ay0:ay1, ax1 - 1] | occupancy[ay0:ay1, ax1]) == 0).tolist()
+        else:
+            pairs = [((x, ay1 - 1), (x, ay1)) for x in range(ax0, ax1)]
+            open_pairs = ((occupancy[ay1 - 1, ax0:ax1] | occupancy[ay1, ax0:ax1]) == 0).tolist()
+
+        labels_a, labels_b = self.cluster_labels(cluster_a), self.cluster_labels(cluster_b)
+        best_runs = {}  # (region in cluster_a, region in cluster_b) -> (length, start) of its longest run
+        run_start = None
+        for i, is_open in enumerate(open_pairs + [False]):
+            if is_open and run_start is None:
+                run_start = i
+            elif not is_open and run_start is not None:
+                cell_a, cell_b = pairs[run_start]
+                regions = (labels_a(cell_a), labels_b(cell_b))
+                if i - run_start > best_runs.get(regions, (0, 0))[0]:
+                    best_runs[regions] = (i - run_start, run_start)
+                run_start = None
+        entrances = [pairs[start + length // 2] for length, start in sorted(best_runs.values(), key=lambda run: run[1])]
+
+        self.entrances[border] = entrances
+        for cell_a, cell_b in entrances:
+            self.transitions.setdefault(cell_a, set()).add(cell_b)
+            self.transitions.setdefault(cell_b, set()).add(cell_a)
+
+    def cluster_block(self, cluster):
+        """Returns the cluster's cached local adjacency lists together with its origin and width."""
+        return self.cluster_data(cluster)[:4]
+
+    def cluster_labels(self, cluster):
+        """Returns a function giving the in-cluster region label of an (x, y) cell of the cluster."""
+        _, x0, y0, block_width, labels = self.cluster_data(cluster)
+        return lambda cell: labels[(cell[1] - y0) * block_width + cell[0] - x0]
+
+    def cluster_data(self, cluster):
+        data = self.blocks.get(cluster)
+        if data is None:
+            x0, y0, x1, y1 = self.cluster_bounds(cluster)
+            block = self.environment.occupancy[y0:y1, x0:x1].tobytes()
+            adjacency = local_adjacency(block, x1 - x0, y1 - y0)
+            data = (adjacency, x0, y0, x1 - x0, local_components(adjacency, block))
+            self.blocks[cluster] = data
+        return data
+
+    def rebuild_intra_edges(self, cluster):
+        adjacency, x0, y0, block_width = self.cluster_block(cluster)
+        edges = {}
+        for node in self.cluster_nodes[cluster]:
+            distances = local_bfs(adjacency, (node[1] - y0) * block_width + node[0] - x0)
+            edges[node] = {other: distances[(other[1] - y0) * block_width + other[0] - x0]
+                           for other in self.cluster_nodes[cluster]
+                           if other != node and distances[(other[1] - y0) * block_width + other[0] - x0] > 0}
+        self.intra_edges[cluster] = edges
+
+    def connect(self, cell):
+        """Returns {node: distance} for the abstract nodes reachable from `cell` inside its cluster."""
+        cluster = self.cluster_of(cell)
+        adjacency, x0, y0, block_width = self.cluster_block(cluster)
+        distances = local_bfs(adjacency, (cell[1] - y0) * block_width + cell[0] - x0)
+        return {node: distances[(node[1] - y0) * block_width + node[0] - x0]
+                for node in self.cluster_nodes.get(cluster, ())
+                if distances[(node[1] - y0) * block_width + node[0] - x0] >= 0}
+
+    def local_path(self, source, target):
+        """Shortest path between two cells of the same cluster that stays inside it, or None."""
+        adjacency, x0, y0, block_width = self.cluster_block(self.cluster_of(source))
+        parents = [-1] * len(adjacency)
+        local_source = (source[1] - y0) * block_width + source[0] - x0
+        local_target = (target[1] - y0) * block_width + target[0] - x0
+        distances = local_bfs(adjacency, local_source, parents, local_target)
+        if distances[local_target] < 0:
+            return None
+        path = []
+        current = local_target
+        while current != -1:
+            y, x = divmod(current, block_width)
+            path.append((x + x0, y + y0))
+            current = parents[current] if current != local_source else -1
+        path.reverse()
+        return path
+
+
+class HierarchicalPlanner(SearchPlanner):
+    """
+    Hierarchical path-finding A* (HPA*).
+
+    Searches the cached AbstractGraph of the environment and then refines each abstract edge
+    into cells inside a single cluster. Paths are near-optimal rather than optimal: the route
+    is restricted to pass through the chosen cluster entrances.
+    """
+
+    def __init__(self, sensor=None, cluster_size=32):
+        self.cluster_size = cluster_size
+
+    def abstract_graph(self, environment: Environment) -> AbstractGraph:
+        """Returns the environment's cached abstract graph for this cluster size, updated to its current state."""
+        key = ("hierarchical", self.cluster_size)
+        graph = environment.planning_cache.get(key)
+        if graph is None:
+            graph = AbstractGraph(environment, self.cluster_size)
+            environment.planning_cache[key] = graph
+        graph.refresh()
+        return graph
+
+    def begin(self, environment: Environment):
+        return (self.abstract_graph(environment), {}), (int(environment.goal[0]), int(environment.goal[1]))
+
+    def trace_path(self, environment: Environment, search, node):
+        return self.abstract_path(search[1], node)
+
+    def result_path(self, environment: Environment, search, node):
+        graph, parents = search
+        return self.refine(graph, self.abstract_path(parents, node))
+
+    def expand(self, environment: Environment, graph: AbstractGraph, parents):
+        """
+        A* over the abstract graph with the start and goal temporarily linked into it.
+
+        Fills `parents` in place and yields (node, step) for every node expanded.
+        """
+        start = (int(environment.start[0]), int(environment.start[1]))
+        goal = (int(environment.goal[0]), int(environment.goal[1]))
+        heuristic = self.heuristic
+        start_edges = graph.connect(start)
+        goal_edges = graph.connect(goal)
+        if graph.cluster_of(start) == graph.cluster_of(goal):
+            local_path = graph.local_path(start, goal)
+            if local_path:
+                start_edges[goal] = len(local_path) - 1
+
+        open_heap = [(heuristic(start, goal), 0, start)]
+        g_score = {start: 0}
+        parents[start] = None
+        step = 0
+
+        while open_heap:
+            _, neg_g, current = heapq.heappop(open_heap)
+            current_g_score = -neg_g
+            if current_g_score > g_score[current]:
+                continue  # Stale entry
+            step += 1
+            yield current, step
+
+            if current == goal:
+                return
+
+            if current == start:
+                edges = list(start_edges.items())
+            else:
+                edges = list(graph.intra_edges.get(graph.cluster_of(current), {}).get(current, {}).items())
+                if current in goal_edges:
+                    edges.append((goal, goal_edges[current]))
+            edges.extend((node, 1) for node in graph.transitions.get(current, ()))
+
+            for neighbor, cost in edges:
+                tentative_g_score = current_g_score + cost
+                if tentative_g_score < g_score.get(neighbor, tentative_g_score + 1):
+                    g_score[neighbor] = tentative_g_score
+                    parents[neighbor] = current
+                    f_score = tentative_g_score + heuristic(neighbor, goal)
+                    heapq.heappush(open_heap, (f_score, -tentative_g_score, neighbor))
+
+    def abstract_path(self, parents, node):
+        path = []
+        while node is not None:
+            path.append(node)
+            node = parents[node]
+        path.reverse()
+        return path
+
+    def refine(self, graph: AbstractGraph, abstract_path):
+        """Expands consecutive abstract nodes into the cells between them."""
+        path = [abstract_path[0]]
+        for source, target in zip(abstract_path, abstract_path[1:]):
+            if graph.cluster_of(source) != graph.cluster_of(target):
+                path.append(target)  # Transition across a cluster border
+            else:
+                path.extend(graph.local_path(source, target)[1:])
+        return path
@@ -0,0 +1,212 @@
+import heapq
+import math
+
+from src.core.environment import Environment
+from src.core.motion_planner import MotionPlanner
+from src.utils.grid import manhattan, to_index, to_position
+
+
+class DStarLitePlanner(MotionPlanner):
+    """
+    D* Lite incremental planner for 4-connected uniform-cost grids.
+
+    The search runs from the goal towards the start and keeps its g/rhs values between calls to
+    plan(). Cells edited through the Environment (editor painting, sensor discoveries, ...) are
+    picked up through its change listeners, and cells changed behind its back can be passed to
+    update(). The next plan() then only repairs the values the changes invalidated, and moving
+    the start (an agent walking along the path) is absorbed with the usual key modifier.
+    """
+
+    def __init__(self, sensor=None):
+        self.environment = None
+        self.needs_reset = True
+        self.pending_cells = set()
+
+    def on_environment_changed(self, cells):
+        if cells is None:
+            self.needs_reset = True
+        else:
+            self.pending_cells.update(cells)
+
+    def update(self, cells):
+        """Queues a batch of changed (x, y) cells to be repaired on the next call to plan()."""
+        self.pending_cells.update((int(x), int(y)) for x, y in cells)
+
+    def plan(self, environment: Environment) -> (list, int):
+        if not environment.start or not environment.goal:
+            return None, 0
+
+        self.prepare(environment)
+        step = 0
+        for current in self.compute_shortest_path():
+            step += 1
+            if self.traces(step):
+                yield [to_position(current, self.width)], step
+
+        path = self.extract_path()
+        if path is None:
+            return None, step  # No path found
+        yield path, step
+        return path, step
+
+    def find_path(self, environment: Environment) -> (list, int):
+        """Repairs (or computes) the solution without yielding intermediate states."""
+        if not environment.start or not environment.goal:
+            return None, 0
+
+        self.prepare(environment)
+        step = 0
+        for _ in self.compute_shortest_path():
+            step += 1
+        return self.extract_path(), step
+
+    def prepare(self, environment: Environment):
+        goal = to_index(environment.goal, environment.width)
+        if self.needs_reset or environment is not self.environment or \
+                (environment.width, environment.height) != (self.width, self.height) or goal != self.goal:
+            self.reset(environment)
+            return
+
+        start = to_index(environment.start, self.width)
+        if start != self.start:
+            # The agent moved: keep the old keys valid by raising every new key by the distance moved
+            self.key_modifier += self.index_heuristic(self.start, start)
+            self.start = start
+        self.apply_changes()
+
+    def reset(self, environment: Environment):
+        if self.environment is not None:
+            self.environment.remove_change_listener(self.on_environment_changed)
+        self.environment = environment
+        environment.add_change_listener(self.on_environment_changed)
+        self.needs_reset = False
+        self.pending_cells = set()
+
+        self.width, self.height = environment.width, environment.height
+        self.blocked = bytearray(environment.occupancy.tobytes())  # Grid as last seen by the search
+        self.g = [math.inf] * (self.width * self.height)
+        self.rhs = [math.inf] * (self.width * self.height)
+        self.start = to_index(environment.start, self.width)
+        self.goal = to_index(environment.goal, self.width)
+        self.key_modifier = 0
+        self.open_heap = []
+        self.open_keys = {}
+
+        self.rhs[self.goal] = 0
+        self.update_vertex(self.goal)
+
+    def index_heuristic(self, a, b):
+        return manhattan(to_position(a, self.width), to_position(b, self.width))
+
+    def neighbors(self, index):
+        y, x = divmod(index, self.width)
+        if y + 1 < self.height:
+            yield index + self.width
+        if y > 0:
+            yield index - self.width
+        if x + 1 < self.width:
+            yield index + 1
+        if x > 0:
+            yield index - 1
+
+    def cost(self, a, b):
+        return math.inf if self.blocked[a] or self.blocked[b] else 1
+
+    def calculate_key(self, index):
+        best = min(self.g[index], self.rhs[index])
+        return best + self.index_heuristic(self.start, index) + self.key_modifier, best
+
+    def update_vertex(self, index):
+        if self.g[index] != self.rhs[index]:
+            key = self.calculate_key(index)
+            self.open_keys[index] = key
+            heapq.heappush(self.open_heap, (key, index))
+        else:
+            self.open_keys.pop(index, None)
+
+    def top(self):
+        # Drop heap entries whose node was removed or re-queued with another key (lazy deletion)
+        while self.open_heap:
+            key, index = self.open_heap[0]
+            if self.open_keys.get(index) == key:
+                return key, index
+            heapq.heappop(self.open_heap)
+        return (math.inf, math.inf), None
+
+    def best_successor_cost(self, index):
+        return min((self.cost(index, neighbor) + self.g[neighbor] for neighbor in self.neighbors(index)),
+                   default=math.inf)
+
+    def compute_shortest_path(self):
+        """Processes inconsistent nodes until the start is consistent, yielding each processed node."""
+        g, rhs = self.g, self.rhs
+        while True:
+            old_key, current = self.top()
+            if current is None or not (old_key < self.calculate_key(self.start) or rhs[self.start] != g[self.start]):
+                return
+
+            new_key = self.calculate_key(current)
+            if old_key < new_key:
+                self.open_keys[current] = new_key
+                heapq.heappush(self.open_heap, (new_key, current))
+                continue
+
+            if g[current] > rhs[current]:
+                # Overconsistent: settle the node and relax its predecessors
+                g[current] = rhs[current]
+                self.open_keys.pop(current, None)
+                for neighbor in self.neighbors(current):
+                    if neighbor != self.goal:
+                        rhs[neighbor] = min(rhs[neighbor], self.cost(neighbor, current) + g[current])
+                        self.update_vertex(neighbor)
+            else:
+                # Underconsistent: invalidate the node and everything that relied on it
+                old_g = g[current]
+                g[current] = math.inf
+                for neighbor in self.neighbors(current):
+                    if neighbor != self.goal and rhs[neighbor] == self.cost(neighbor, current) + old_g:
+                        rhs[neighbor] = self.best_successor_cost(neighbor)
+                    self.update_vertex(neighbor)
+                if current != self.goal:
+                    rhs[current] = self.best_successor_cost(current)
+                self.update_vertex(current)
+            yield current
+
+    def apply_changes(self):
+        """Updates rhs values around every queued cell whose blocked state really changed."""
+        occupancy = self.environment.occupancy
+        for x, y in self.pending_cells:
+            if not (0 <= x < self.width and 0 <= y < self.height):
+                continue
+            changed = y * self.width + x
+            is_blocked = 1 if occupancy[y, x] else 0
+            if is_blocked == self.blocked[changed]:
+                continue
+
+            neighbors = list(self.neighbors(changed))
+            old_costs = [self.cost(changed, neighbor) for neighbor in neighbors]
+            self.blocked[changed] = is_blocked
+            for neighbor, old_cost in zip(neighbors, old_costs):
+                new_cost = self.cost(changed, neighbor)
+                # Grid edges are symmetric, so both directions change the same way
+                for source, target in ((neighbor, changed), (changed, neighbor)):
+                    if source != self.goal:
+                        if old_cost > new_cost:
+                            self.rhs[source] = min(self.rhs[source], new_cost + self.g[target])
+                        elif self.rhs[source] == old_cost + self.g[target]:
+                            self.rhs[source] = self.best_successor_cost(source)
+                    self.update_vertex(source)
+        self.pending_cells = set()
+
+    def extract_path(self):
+        """Follows the cheapest successors from the start to the goal, or returns None if there is no path."""
+        if self.g[self.start] == math.inf:
+            return None
+        current = self.start
+        path = [to_position(current, self.width)]
+        while current != self.goal and len(path) <= len(self.g):
+            current = min(self.neighbors(current), key=lambda neighbor: self.cost(current, neighbor) + self.g[neighbor])
+            if self.g[current] == math.inf:
+                return None
+            path.append(to_position(current, self.width))
+        return path
@@ -0,0 +1,169 @@
+import heapq
+
+import numpy as np
+
+from src.core.environment import Environment
+from src.core.motion_planner import SearchPlanner
+
+
+def jump_table(jump, blocked):
+    """
+    For every cell, scans along +x and reports what is found first.
+
+    Args:
+        jump: (height, width) boolean array of cells that stop a scan as jump points.
+        blocked: (height, width) boolean array of cells that stop a scan as walls.
+
+    Returns:
+        An int32 array holding k > 0 if the first stop is a jump point k cells away, or -k if
+        the first stop is a wall (or the grid edge) k cells away.
+    """
+    height, width = jump.shape
+    columns = np.arange(width)
+    stops = np.where(jump | blocked, columns, width)
+    next_stop = np.minimum.accumulate(stops[:, ::-1], axis=1)[:, ::-1]
+    # Scans start at the neighbouring cell, so the cell itself never counts as a stop
+    next_stop = np.concatenate((next_stop[:, 1:], np.full((height, 1), width)), axis=1)
+    distance = next_stop - columns
+    hits_jump = np.take_along_axis(jump, np.minimum(next_stop, width - 1), axis=1) & (next_stop < width)
+    return np.where(hits_jump, distance, -distance).astype(np.int32)
+
+
+class JumpPointSearchPlanner(SearchPlanner):
+    """
+    Jump Point Search for 4-connected uniform-cost grids.
+
+    Canonical paths move vertically before horizontally, so vertical moves play the part
+    diagonal moves play in 8-connected JPS: every vertical step scans left and right, and a
+    horizontal scan only stops where an obstacle behind it forces a vertical turn. All scan
+    results are precomputed from the occupancy grid as jump distance tables, so each jump is a
+    constant-time lookup apart from the goal checks.
+    """
+
+    def __init__(self, sensor=None):
+        pass
+
+    def build_tables(self, environment: Environment):
+        """Returns the jump tables for scans towards +x, -x, +y and -y, flattened."""
+        free = environment.occupancy == 0
+        blocked = ~free
+        padded = np.pad(free, 1, constant_values=False)
+        above, below = padded[:-2, 1:-1], padded[2:, 1:-1]
+        # A horizontal scan stops where a vertical turn is forced by an obstacle behind it
+        forced_east = free & ((above & ~padded[:-2, :-2]) | (below & ~padded[2:, :-2]))
+        forced_west = free & ((above & ~padded[:-2, 2:]) | (below & ~padded[2:, 2:]))
+
+        east = jump_table(forced_east, blocked)
+        west = jump_table(forced_west[:, ::-1], blocked[:, ::-1])[:, ::-1]
+
+        # A vertical scan stops wherever a horizontal scan would find a jump point
+        turning = free & ((east > 0) | (west > 0))
+        south = jump_table(turning.T, blocked.T).T
+        north = jump_table(turning[::-1].T, blocked[::-1].T).T[::-1]
+
+        return {(1, 0): east.ravel(), (-1, 0): west.ravel(), (0, 1): south.ravel(), (0, -1): north.ravel()}
+
+    def begin(self, environment: Environment):
+        return ({},), (int(environment.goal[0]), int(environment.goal[1]))
+
+    def trace_path(self, environment: Environment, search, node):
+        return self.reconstruct_path(search[0], node)
+
+    def expand(self, environment: Environment, parents):
+        """
+        A* over jump points.
+
+        Fills `parents` (jump point -> previous jump point) in place and yields
+        (jump_point, step) for every jump point expanded.
+        """
+        start = (int(environment.start[0]), int(environment.start[1]))
+        goal = (int(environment.goal[0]), int(environment.goal[1]))
+        width = environment.width
+        tables = self.build_tables(environment)
+        blocked = environment.occupancy.tobytes()
+        heuristic = self.heuristic
+
+        open_heap = [(heuristic(start, goal), 0, start)]
+        g_score = {start: 0}
+        parents[start] = None
+        step = 0
+
+        while open_heap:
+            _, neg_g, current = heapq.heappop(open_heap)
+            current_g_score = -neg_g
+            if current_g_score > g_score[current]:
+                continue  # Stale entry
+            step += 1
+            yield current, step
+
+            for direction in self.successor_directions(current, parents[current], blocked, environment):
+                jump_point = self.jump(current, direction, goal, tables, width)
+                if jump_point is None:
+                    continue
+                tentative_g_score = current_g_score + heuristic(current, jump_point)
+                if tentative_g_score < g_score.get(jump_point, tentative_g_score + 1):
+                    g_score[jump_point] = tentative_g_score
+                    parents[jump_point] = current
+                    f_score = tentative_g_score + heuristic(jump_point, goal)
+                    heapq.heappush(open_heap, (f_score, -tentative_g_score, jump_point))
+
+    def successor_directions(self, current, parent, blocked, environment: Environment):
+        if parent is None:
+            return (0, 1), (0, -1), (1, 0), (-1, 0)
+
+        x, y = current
+        if parent[1] != y:
+            # Arrived vertically: keep going and branch both ways horizontally
+            dy = 1 if y > parent[1] else -1
+            return (0, dy), (1, 0), (-1, 0)
+
+        # Arrived horizontally: keep going, plus any vertical turn forced by an obstacle behind
+        width, height = environment.width, environment.height
+        dx = 1 if x > parent[0] else -1
+        directions = [(dx, 0)]
+        for dy in (1, -1):
+            if 0 <= y + dy < height and not blocked[(y + dy) * width + x] and (
+                    not 0 <= x - dx < width or blocked[(y + dy) * width + x - dx]):
+                directions.append((0, dy))
+        return directions
+
+    def jump(self, current, direction, goal, tables, width):
+        """Returns the next jump point from `current` in `direction`, or None if the scan hits a wall."""
+        x, y = current
+        dx, dy = direction
+        stop = int(tables[direction][y * width + x])
+        reach = stop if stop > 0 else -stop - 1  # Cells that can be scanned before the stop
+
+        if dx:
+            if y == goal[1] and 0 < (goal[0] - x) * dx <= reach:
+                return goal
+            return (x + stop * dx, y) if stop > 0 else None
+
+        # Vertical scan: the goal row also stops it if the goal can be reached horizontally from there
+        distance_to_goal_row = (goal[1] - y) * dy
+        if 0 < distance_to_goal_row <= reach:
+            goal_row_cell = (x, goal[1])
+            if goal_row_cell == goal or self.reaches_goal(goal_row_cell, goal, tables, width):
+                return goal_row_cell
+        return (x, y + stop * dy) if stop > 0 else None
+
+    def reaches_goal(self, cell, goal, tables, width):
+        dx = 1 if goal[0] > cell[0] else -1
+        stop = int(tables[(dx, 0)][cell[1] * width + cell[0]])
+        return stop > 0 or abs(goal[0] - cell[0]) < -stop
+
+    def reconstruct_path(self, parents, node):
+        """Expands the chain of jump points ending at `node` into the full cell path."""
+        jump_points = []
+        while node is not None:
+            jump_points.append(node)
+            node = parents[node]
+        jump_points.reverse()
+
+        path = [jump_points[0]]
+        for (x0, y0), (x1, y1) in zip(jump_points, jump_points[1:]):
+            dx = (x1 > x0) - (x1 < x0)
+            dy = (y1 > y0) - (y1 < y0)
+            for i in range(1, abs(x1 - x0) + abs(y1 - y0) + 1):
+                path.append((x0 + i * dx, y0 + i * dy))
+        return path
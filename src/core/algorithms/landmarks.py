@@ -0,0 +1,154 @@
+import os
+
+import numpy as np
+
+from src.core.algorithms.search_algorithms import AStarPlanner
+from src.core.environment import Environment
+from src.utils.grid import to_index, wavefront
+
+
+class LandmarkTable:
+    """
+    Exact hop distances from a few landmark cells to every cell of an environment.
+
+    By the triangle inequality, |d(L, goal) - d(L, v)| is a lower bound on d(v, goal) for every
+    landmark L, which makes a much better informed A* heuristic than Manhattan distance on
+    maze-like maps. Distances are stored as uint16 when they fit (int32 otherwise), with the
+    dtype's maximum value marking unreachable cells.
+    """
+
+    def __init__(self, landmarks, distances, width, height, content_hash, version=None):
+        self.landmarks = landmarks  # List of (x, y) landmark cells
+        self.distances = distances  # (landmark_count, height * width) array
+        self.width = width
+        self.height = height
+        self.content_hash = content_hash
+        self.version = version  # Environment.version the table was built against, if built in this process
+        self.unreachable = np.iinfo(distances.dtype).max
+
+    @classmethod
+    def build(cls, environment: Environment, count=8):
+        """
+        Picks up to `count` landmarks by farthest-point selection and computes their distance fields.
+
+        The first landmark is the cell farthest from an arbitrary free cell; every next one is the
+        cell farthest from all landmarks chosen so far. Cells no landmark reaches yet count as
+        infinitely far, so disconnected regions receive landmarks too.
+        """
+        free = environment.occupancy == 0
+        free_cells = np.flatnonzero(free)
+        fields = []
+        landmarks = []
+        if free_cells.size:
+            nearest = wavefront(free, [free_cells[0]]).ravel().astype(np.int64)
+            nearest[nearest < 0] = np.iinfo(np.int64).max
+            for _ in range(count):
+                candidates = np.where(free.ravel(), nearest, -1)
+                landmark = int(np.argmax(candidates))
+                if candidates[landmark] <= 0 and landmarks:
+                    break  # Every free cell already is a landmark
+                field = wavefront(free, [landmark]).ravel()
+                landmarks.append((landmark % environment.width, landmark // environment.width))
+                fields.append(field)
+                reached = np.where(field >= 0, field, np.iinfo(np.int64).max)
+                nearest = reached if len(fields) == 1 else np.minimum(nearest, reached)
+
+        distances = np.array(fields, dtype=np.int64).reshape(len(fields), environment.width * environment.height)
+        dtype = np.uint16 if distances.size == 0 or distances.max() < np.iinfo(np.uint16).max else np.int32
+        compact = np.where(distances >= 0, distances, np.iinfo(dtype).max).astype(dtype)
+        return cls(landmarks, compact, environment.width, environment.height, environment.content_hash(),
+                   environment.version)
+
+    def matches(self, environment: Environment):
+        if self.version is not None and self.version == environment.version:
+            return True
+        return (self.width, self.height) == (environment.width, environment.height) and \
+            self.content_hash == environment.content_hash()
+
+    def goal_bounds(self, goal):
+        """
+        Returns the ALT lower bound on the distance to `goal` for every cell, as a flat int64 array.
+
+        Cells that cannot reach the goal get a very large bound so A* never expands them.
+        """
+        goal_index = to_index(goal, self.width)
+        bounds = np.zeros(self.width * self.height, dtype=np.int64)
+        for field in self.distances:
+            goal_distance = int(field[goal_index])
+            if goal_distance == self.unreachable:
+                continue
+            field = field.astype(np.int64)
+            bound = np.abs(field - goal_distance)
+            # A cell this landmark cannot reach lies in a different region than the goal
+            bound[field == self.unreachable] = np.iinfo(np.int32).max
+            np.maximum(bounds, bound, out=bounds)
+        return bounds
+
+    def save(self, path):
+        # Write through a file handle so the table lands at `path` itself; given a name,
+        # savez_compressed would append ".npz" and load(path) would never find it
+        with open(path, "wb") as file:
+            np.savez_compressed(file, landmarks=np.array(self.landmarks, dtype=np.int32).reshape(-1, 2),
+                                distances=self.distances, shape=np.array([self.width, self.height]),
+                                content_hash=np.array(self.content_hash))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            width, height = (int(value) for value in data["shape"])
+            landmarks = [tuple(int(value) for value in cell) for cell in data["landmarks"]]
+            return cls(landmarks, data["distances"], width, height, str(data["content_hash"]))
+
+
+class ALTPlanner(AStarPlanner):
+    """
+    A* with landmark (ALT) lower bounds.
+
+    The landmark table is cached in the environment's planning_cache and reused by every query
+    until the environment changes. With `landmark_file` set, the table is also persisted there
+    (e.g. next to a saved map) and loaded instead of rebuilt while the map content matches.
+    """
+
+    def __init__(self, sensor=None, heuristic_weight=1.0, landmark_count=8, landmark_file=None):
+        super().__init__(sensor, heuristic_weight)
+        self.landmark_count = landmark_count
+        self.landmark_file = landmark_file
+        self.bounds = None
+        self.bounds_goal = None
+
+    def landmark_table(self, environment: Environment) -> LandmarkTable:
+        """Returns the environment's landmark table, loading or rebuilding it if it is missing or stale."""
+        key = ("landmarks", self.landmark_count)
+        table = environment.planning_cache.get(key)
+        if table is not None and table.matches(environment):
+            return table
+
+        table = None
+        if self.landmark_file and os.path.exists(self.landmark_file):
+            table = LandmarkTable.load(self.landmark_file)
+            if not table.matches(environment) or len(table.landmarks) > self.landmark_count:
+                table = None
+            else:
+                table.version = environment.version
+        if table is None:
+            table = LandmarkTable.build(environment, self.landmark_count)
+            if self.landmark_file:
+                table.save(self.landmark_file)
+        environment.planning_cache[key] = table
+        return table
+
+    def heuristic(self, a, b):
+        manhattan = abs(a[0] - b[0]) + abs(a[1] - b[1])
+        if self.bounds is None or b != self.bounds_goal:
+            return manhattan
+        return max(manhattan, int(self.bounds[int(a[1]) * self.width + int(a[0])]))
+
+    def expand(self, environment: Environment, g_score, parents):
+        table = self.landmark_table(environment)
+        self.width = environment.width
+        self.bounds_goal = environment.goal
+        self.bounds = table.goal_bounds(environment.goal)
+        try:
+            yield from super().expand(environment, g_score, parents)
+        finally:
+            self.bounds = None
@@ -1,9 +1,13 @@
 
 import math
-from collections import deque
 
+import numpy as np
+
+from src.config import config_instance as CONFIG
 from src.core.environment import Environment
+from src.core.field_cache import DistanceFieldCache, field_cache_instance
 from src.core.motion_planner import MotionPlanner
+from src.utils.grid import descend, to_index, wavefront, wavefront_levels
 
 
 class PotentialFieldPlanner(MotionPlanner):
@@ -22,7 +26,8 @@ class PotentialFieldPlanner(MotionPlanner):
 
         current = environment.start
         path = [current]
-        yield path, self.step
+        if self.traces(self.step):
+            yield path, self.step
 
         while self.calculate_distance(current, environment.goal) > self.step_size:
             self.step += 1
@@ -39,16 +44,19 @@ class PotentialFieldPlanner(MotionPlanner):
 
             # Check for collisions
             if not environment.is_valid(new_x, new_y):
-                print("Collision detected or position outside environment")
+                if CONFIG.debug:
+                    print("Collision detected or position outside environment")
                 yield path, self.step
                 return
 
             current = (new_x, new_y)
             path.append(current)
-            yield path, self.step
+            if self.traces(self.step):
+                yield path, self.step
 
             if len(path) > 1000:  # Prevent infinite loops (you might need a better way to detect this)
-                print("Path too long - potential local minimum or oscillation")
+                if CONFIG.debug:
+                    print("Path too long - potential local minimum or oscillation")
                 yield path, self.step
                 return
 
@@ -72,101 +80,238 @@ class PotentialFieldPlanner(MotionPlanner):
         return (force_x, force_y)
 
     def calculate_repulsive_force(self, current, environment):
-        total_repulsive_force_x = 0
-        total_repulsive_force_y = 0
-
         if self.sensor:
-            print("Using sensor to detect obstacles")
             # Use sensor to detect obstacles if available
-            sensor_data = self.sensor.sense(environment, current)
-            obstacles_in_range = sensor_data.get("obstacles_in_range", [])
-            print(obstacles_in_range)
+            sensor_data = self.sensor.reading(environment, current)
+            obstacles_in_range = np.array(list(sensor_data.get("obstacles_in_range", [])),
+                                          dtype=np.float64).reshape(-1, 2)
+            if CONFIG.debug:
+                print(f"Sensor reports {len(obstacles_in_range)} obstacles in range")
         else:
-            print("No sensor provided - using all obstacles in environment")
-            # Fallback to environment.obstacles if no sensor is provided
-            obstacles_in_range = environment.obstacles
+            # Fallback to the environment's occupancy grid if no sensor is provided
+            obstacles_in_range = self.obstacles_near(current, environment)
+
+        # Sum the repulsion of every obstacle within min_repulsive_distance in one go
+        offsets = np.asarray(current, dtype=np.float64) - obstacles_in_range
+        distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        near = (distances <= self.min_repulsive_distance) & (distances > 0)
+        if not near.any():
+            return (0.0, 0.0)
+
+        distances = distances[near]
+        force_magnitudes = self.repulsive_gain * (1.0 / distances - 1.0 / self.min_repulsive_distance) / (
+                distances ** 2)
+        force_x, force_y = (offsets[near] * (force_magnitudes / distances)[:, None]).sum(axis=0)
+        return (float(force_x), float(force_y))
+
+    def obstacles_near(self, current, environment):
+        """Returns the (x, y) obstacle cells in the square window of radius min_repulsive_distance around `current`."""
+        radius = self.min_repulsive_distance
+        x0 = max(int(math.floor(current[0] - radius)), 0)
+        y0 = max(int(math.floor(current[1] - radius)), 0)
+        x1 = min(int(math.ceil(current[0] + radius)), environment.width - 1)
+        y1 = min(int(math.ceil(current[1] + radius)), environment.height - 1)
+        if x0 > x1 or y0 > y1:
+            return np.zeros((0, 2), dtype=np.float64)
+
+        ys, xs = np.nonzero(environment.occupancy[y0:y1 + 1, x0:x1 + 1])
+        return np.column_stack((xs + x0, ys + y0)).astype(np.float64)
 
-        for obstacle in obstacles_in_range:
-            dx = current[0] - obstacle[0]
-            dy = current[1] - obstacle[1]
-            distance = self.calculate_distance(current, obstacle)
-
-            if distance <= self.min_repulsive_distance:
-                force_magnitude = self.repulsive_gain * (1.0 / distance - 1.0 / self.min_repulsive_distance) / (
-                            distance ** 2)
-                force_x = force_magnitude * (dx / distance)
-                force_y = force_magnitude * (dy / distance)
+    def calculate_distance(self, point1, point2):
+        return math.sqrt((point1[0] - point2[0]) ** 2 + (point1[1] - point2[1]) ** 2)
 
-                total_repulsive_force_x += force_x
-                total_repulsive_force_y += force_y
 
-        return (total_repulsive_force_x, total_repulsive_force_y)
+class PotentialFieldGrid:
+    """
+    The attractive and repulsive potential of a fixed goal, sampled at every grid cell.
+
+    The potential is U = 0.5 * attractive_gain * d_goal^2 plus, for every obstacle cell closer
+    than min_repulsive_distance, 0.5 * repulsive_gain * (1 / d - 1 / min_repulsive_distance)^2.
+    Its gradient is evaluated analytically at each cell (the negated gradient is exactly the
+    force PotentialFieldPlanner sums up), and positions between cells are looked up with
+    bilinear interpolation.
+    """
+
+    def __init__(self, potential, gradient, version):
+        self.potential = potential  # (height, width) float32 array
+        self.gradient = gradient  # (height, width, 2) float32 array of (dU/dx, dU/dy)
+        self.version = version  # Environment.version the grid was built against
+        self.height, self.width = potential.shape
+
+    @classmethod
+    def build(cls, environment: Environment, goal, attractive_gain, repulsive_gain, min_repulsive_distance):
+        height, width = environment.height, environment.width
+        ys, xs = np.mgrid[0:height, 0:width]
+        offset_x = (xs - goal[0]).astype(np.float64)
+        offset_y = (ys - goal[1]).astype(np.float64)
+        potential = 0.5 * attractive_gain * (offset_x ** 2 + offset_y ** 2)
+        gradient_x = attractive_gain * offset_x
+        gradient_y = attractive_gain * offset_y
+
+        # Every obstacle pushes on the cells around it the same way, so add the repulsion one
+        # stencil offset at a time: cell (x, y) feels the obstacle at (x - dx, y - dy)
+        obstacles = environment.occupancy.astype(bool)
+        reach = int(math.floor(min_repulsive_distance))
+        for dy in range(-reach, reach + 1):
+            for dx in range(-reach, reach + 1):
+                distance = math.hypot(dx, dy)
+                if distance == 0 or distance > min_repulsive_distance:
+                    continue
+                # Cells whose neighbour at (-dx, -dy) is an obstacle
+                shifted = np.zeros_like(obstacles)
+                shifted[max(dy, 0):height + min(dy, 0), max(dx, 0):width + min(dx, 0)] = \
+                    obstacles[max(-dy, 0):height + min(-dy, 0), max(-dx, 0):width + min(-dx, 0)]
+                closeness = 1.0 / distance - 1.0 / min_repulsive_distance
+                push = repulsive_gain * closeness / distance ** 3
+                potential[shifted] += 0.5 * repulsive_gain * closeness ** 2
+                gradient_x[shifted] -= push * dx
+                gradient_y[shifted] -= push * dy
+
+        gradient = np.stack((gradient_x, gradient_y), axis=-1).astype(np.float32)
+        return cls(potential.astype(np.float32), gradient, environment.version)
+
+    def gradient_at(self, position):
+        """Returns the bilinearly interpolated gradient (dU/dx, dU/dy) at a continuous (x, y) position."""
+        x = min(max(float(position[0]), 0.0), self.width - 1.0)
+        y = min(max(float(position[1]), 0.0), self.height - 1.0)
+        x0 = min(int(x), self.width - 2) if self.width > 1 else 0
+        y0 = min(int(y), self.height - 2) if self.height > 1 else 0
+        corners = self.gradient[y0:y0 + 2, x0:x0 + 2]
+        fx, fy = x - x0, y - y0
+        weights = np.array([[(1 - fx) * (1 - fy), fx * (1 - fy)], [(1 - fx) * fy, fx * fy]])
+        weights = weights[:corners.shape[0], :corners.shape[1]]
+        gradient_x, gradient_y = np.tensordot(weights, corners, axes=([0, 1], [0, 1]))
+        return float(gradient_x), float(gradient_y)
+
+
+class GridPotentialFieldPlanner(PotentialFieldPlanner):
+    """
+    PotentialFieldPlanner that follows a precomputed PotentialFieldGrid.
+
+    The grid is built once per (map content, goal, gains) and kept in a DistanceFieldCache (the
+    shared one unless `field_cache` is given), so every step of every run is a single
+    interpolated gradient lookup while grids of old goals and edited maps are evicted within
+    the cache's memory budget. The field is computed from the whole occupancy grid; a sensor,
+    if given, is not consulted.
+    """
+
+    def __init__(self, sensor=None, attractive_gain=5.0, repulsive_gain=100.0, min_repulsive_distance=2.0,
+                 field_cache: DistanceFieldCache = None):
+        super().__init__(sensor, attractive_gain, repulsive_gain, min_repulsive_distance)
+        self.field_cache = field_cache if field_cache is not None else field_cache_instance
+
+    def potential_grid(self, environment: Environment) -> PotentialFieldGrid:
+        """Returns the potential grid for the environment's current goal, building it if it is not cached."""
+        goal = (float(environment.goal[0]), float(environment.goal[1]))
+        key = self.field_cache.key(environment, "potential_field", goal, self.attractive_gain, self.repulsive_gain,
+                                   self.min_repulsive_distance)
+
+        def build():
+            grid = PotentialFieldGrid.build(environment, goal, self.attractive_gain, self.repulsive_gain,
+                                            self.min_repulsive_distance)
+            return grid.potential, grid.gradient
+
+        potential, gradient = self.field_cache.get_or_compute(key, build)
+        return PotentialFieldGrid(potential, gradient, environment.version)
 
-    def calculate_distance(self, point1, point2):
-        return math.sqrt((point1[0] - point2[0]) ** 2 + (point1[1] - point2[1]) ** 2)
+    def calculate_total_force(self, current, environment):
+        gradient_x, gradient_y = self.potential_grid(environment).gradient_at(current)
+        return (-gradient_x, -gradient_y)
 
 
 class BrushfireWithPathPlanner(MotionPlanner):
-    def __init__(self, sensor=None):
-        pass
-
-    def plan(self, environment: Environment) -> (list, int, list):
+    """
+    Brushfire (wavefront) distance field, followed by gradient descent from the start.
+
+    The field is grown one whole layer per step with NumPy (see utils.grid.wavefront) into an
+    int32 array, -1 marking unreached cells. Modes:
+        "goal": distances to the goal (the default).
+        "multi_source": distances to the nearest of `sources` (x, y) cells, the goal if none are given.
+        "clearance": distances from the nearest obstacle, for clearance maps; no path is extracted.
+
+    plan() yields (path, step, changed) where `changed` is an (N, 3) int32 array of the
+    (x, y, distance) cells set since the previous yield, so consumers keep one distance array
+    and apply the changes to it instead of receiving a copy of the whole grid on every step.
+
+    Finished fields are kept in a DistanceFieldCache (the shared one unless `field_cache` is
+    given), so further queries on the same map and sources skip straight to path extraction.
+    """
+
+    MODES = ("goal", "multi_source", "clearance")
+
+    def __init__(self, sensor=None, mode="goal", sources=None, field_cache: DistanceFieldCache = None):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown brushfire mode {mode!r}, expected one of {self.MODES}")
+        self.mode = mode
+        self.sources = sources
+        self.field_cache = field_cache if field_cache is not None else field_cache_instance
+
+    def source_indices(self, environment: Environment):
+        """Returns the flat indices the wave starts from in the current mode."""
+        if self.mode == "clearance":
+            return np.flatnonzero(environment.occupancy)
+        cells = self.sources if self.mode == "multi_source" and self.sources else [environment.goal]
+        return [to_index(cell, environment.width) for cell in cells]
+
+    def field_key(self, environment: Environment, sources):
+        if self.mode == "clearance":
+            return self.field_cache.key(environment, "brushfire", self.mode)
+        return self.field_cache.key(environment, "brushfire", self.mode, tuple(sorted(set(sources))))
+
+    def distance_field(self, environment: Environment):
+        """Returns the (height, width) int32 brushfire distances of the current mode, -1 where unreached (read-only)."""
+        sources = self.source_indices(environment)
+        return self.field_cache.get_or_compute(self.field_key(environment, sources),
+                                               lambda: wavefront(environment.occupancy == 0, sources))
+
+    def plan(self, environment: Environment) -> (list, int, np.ndarray):
         if not environment.start or not environment.goal:
             return
 
-        start = environment.start
-        goal = environment.goal
         width, height = environment.width, environment.height
-        distance_grid = [[-1 for _ in range(width)] for _ in range(height)]  # -1 indicates not reached
-        queue = deque([(goal, 0)])  # (cell, distance)
-        distance_grid[int(goal[1])][int(goal[0])] = 0
+        sources = self.source_indices(environment)
+        key = self.field_key(environment, sources)
+        cached = self.field_cache.get(key)
         step = 0
+        traces = self.traces
 
-        # Brushfire Calculation with Yield
-        while queue:
-            current_cell, dist = queue.popleft()
-            step += 1
-
-            for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-                neighbor_x, neighbor_y = int(current_cell[0] + dx), int(current_cell[1] + dy)
-
-                if 0 <= neighbor_x < width and 0 <= neighbor_y < height and \
-                        environment.is_valid(neighbor_x, neighbor_y) and \
-                        distance_grid[neighbor_y][neighbor_x] == -1:
-                    distance_grid[neighbor_y][neighbor_x] = dist + 1
-                    queue.append(((neighbor_x, neighbor_y), dist + 1))
-
-            yield [], step, [row[:] for row in distance_grid]  # Yielding during Brushfire
+        if cached is not None:
+            # Same map and sources as an earlier run: skip the wavefront entirely
+            distances = cached.ravel()
+            changed = self.frame([np.flatnonzero(distances >= 0)], distances, width)
+        else:
+            distances = np.full(width * height, -1, dtype=np.int32)
+            reached = []  # Frontiers set since the last yield
+
+            # Brushfire Calculation with Yield, one layer per step
+            for _, frontier in wavefront_levels(environment.occupancy == 0, sources, distances):
+                step += 1
+                reached.append(frontier)
+                if traces(step):
+                    yield [], step, self.frame(reached, distances, width)
+                    reached = []
+            changed = self.frame(reached, distances, width)
+            self.field_cache.put(key, distances.reshape(height, width))
+
+        if self.mode == "clearance":
+            yield [], step, changed
+            return None, step
 
         # Path Extraction (Gradient Descent) with Yield
-        current = start
-        path = [current]
-
-        while current != goal:
+        path = descend(distances, to_index(environment.start, width), width, height)
+        if path is None:
+            yield [], step, changed  # Start not reached by the wave
+            return None, step
+        for length in range(1, len(path)):
             step += 1
-            neighbors = []
-            for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-                nx, ny = int(current[0] + dx), int(current[1] + dy)
-                if 0 <= nx < width and 0 <= ny < height and environment.is_valid(nx, ny):
-                    neighbors.append((nx, ny))
-
-            if not neighbors:
-                yield path, step, distance_grid  # Stuck, yield current state
-                return
-
-            min_distance = float('inf')
-            next_move = None
-            for nx, ny in neighbors:
-                if distance_grid[ny][nx] != -1 and distance_grid[ny][nx] < min_distance:
-                    min_distance = distance_grid[ny][nx]
-                    next_move = (nx, ny)
-
-            if next_move:
-                current = next_move
-                path.append(current)
-                yield path, step, distance_grid  # Yielding during path extraction
-            else:
-                yield path, step, distance_grid  # Stuck, yield current state
-                return
-
-        yield path, step, distance_grid  # Goal reached
+            if traces(step):
+                yield path[:length], step, changed  # Yielding during path extraction
+                changed = changed[:0]
+        yield path, step, changed  # Goal reached, or stuck at the end of the path
+        return path, step
+
+    @staticmethod
+    def frame(frontiers, distances, width):
+        """Packs reached frontiers into an (N, 3) int32 array of (x, y, distance) rows."""
+        cells = np.concatenate(frontiers) if frontiers else np.zeros(0, dtype=np.intp)
+        return np.column_stack((cells % width, cells // width, distances[cells])).astype(np.int32)
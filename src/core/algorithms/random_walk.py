@@ -26,10 +26,9 @@ class RandomWalkPlanner(MotionPlanner):
             valid_neighbors = [n for n in neighbors if environment.is_valid(n[0], n[1])]
 
             if self.sensor:
-                sensor_data = self.sensor.sense(environment, current)
-                print(sensor_data)
+                obstacles = self.sensor.sense_obstacles(environment, current)
                 # Use sensor data to influence choices (example)
-                valid_neighbors = [n for n in valid_neighbors if n not in sensor_data["obstacles_in_range"]]
+                valid_neighbors = [n for n in valid_neighbors if n not in obstacles]
 
             if not valid_neighbors:
                 yield path, i  # Yield path so far (stuck)
@@ -38,4 +37,8 @@ class RandomWalkPlanner(MotionPlanner):
             current = random.choice(valid_neighbors)
             path.append(current)
 
-            yield path, i  # Yield the current path after each step
+            if self.traces(i):
+                yield path, i  # Yield the current path after each step
+
+        if not self.traces(max_steps - 1):
+            yield path, max_steps - 1  # Out of steps; the last one was not yielded above
@@ -1,155 +1,223 @@
+import heapq
+import math
 from collections import deque
 
+import numpy as np
+
 from src.core.environment import Environment
-from src.core.motion_planner import MotionPlanner
+from src.core.field_cache import DistanceFieldCache, field_cache_instance
+from src.core.motion_planner import SearchPlanner
+from src.utils.grid import new_parents, to_index, wavefront
 
 
-class BreadthFirstSearchPlanner(MotionPlanner):
+class BreadthFirstSearchPlanner(SearchPlanner):
     def __init__(self, sensor=None):
         pass
 
-    def plan(self, environment: Environment) -> (list, int):
-        if not environment.start or not environment.goal:
-            return None, 0
-
-        start = environment.start
-        goal = environment.goal
-        queue = deque([(start, [start])])  # Queue of (current_node, path_so_far)
-        visited = {start}
+    def distance_field(self, environment: Environment, source=None, target=None):
+        """
+        Frontier-at-once BFS with NumPy, for reachability queries on large maps.
+
+        Args:
+            environment: The Environment object.
+            source: (x, y) cell to search from; defaults to environment.start.
+            target: Optional (x, y) cell; the search stops once it has been reached.
+
+        Returns:
+            A (height, width) int32 array of hop distances from `source`, -1 where unreachable.
+        """
+        width = environment.width
+        source = source if source is not None else environment.start
+        target = to_index(target, width) if target is not None else None
+        return wavefront(environment.occupancy == 0, [to_index(source, width)], target)
+
+    def expand(self, environment: Environment, parents):
+        """
+        Queue-based BFS over flat cell indices.
+
+        Fills `parents` in place and yields (cell_index, step) for every dequeued cell.
+        """
+        width, height = environment.width, environment.height
+        blocked = environment.occupancy.tobytes()
+        start = to_index(environment.start, width)
+        queue = deque([start])
+        visited = bytearray(width * height)
+        visited[start] = 1
         step = 0
 
         while queue:
-            current, path = queue.popleft()
+            current = queue.popleft()
             step += 1
-            yield path, step
-
-            if current == goal:
-                return path, step
-
-            for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-                next_x, next_y = current[0] + dx, current[1] + dy
-                neighbor = (next_x, next_y)
+            yield current, step
 
-                if environment.is_valid(next_x, next_y) and neighbor not in visited:
-                    visited.add(neighbor)
-                    queue.append((neighbor, path + [neighbor]))
+            y, x = divmod(current, width)
+            for next_x, next_y in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)):
+                if not (0 <= next_x < width and 0 <= next_y < height):
+                    continue
+                neighbor = next_y * width + next_x
+                if not blocked[neighbor] and not visited[neighbor]:
+                    visited[neighbor] = 1
+                    parents[neighbor] = current
+                    queue.append(neighbor)
 
-        return None, step  # No path found
 
-
-class DepthFirstSearchPlanner(MotionPlanner):
+class DepthFirstSearchPlanner(SearchPlanner):
     def __init__(self, sensor=None):
         pass
 
-    def plan(self, environment: Environment) -> (list, int):
-        if not environment.start or not environment.goal:
-            return None, 0
-
-        start = environment.start
-        goal = environment.goal
-        stack = [(start, [start])]  # Stack of (current_node, path_so_far)
-        visited = {start}
+    def expand(self, environment: Environment, parents):
+        """
+        Stack-based DFS over flat cell indices.
+
+        Fills `parents` in place and yields (cell_index, step) for every popped cell.
+        """
+        width, height = environment.width, environment.height
+        blocked = environment.occupancy.tobytes()
+        start = to_index(environment.start, width)
+        stack = [start]
+        visited = bytearray(width * height)
+        visited[start] = 1
         step = 0
 
         while stack:
-            current, path = stack.pop()
+            current = stack.pop()
             step += 1
-            yield path, step
-
-            if current == goal:
-                return path, step
-
-            for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-                next_x, next_y = current[0] + dx, current[1] + dy
-                neighbor = (next_x, next_y)
-
-                if environment.is_valid(next_x, next_y) and neighbor not in visited:
-                    visited.add(neighbor)
-                    stack.append((neighbor, path + [neighbor]))
-
-        return None, step  # No path found
-
-
-class DijkstraPlanner(MotionPlanner):
-    def __init__(self, sensor=None):
-        pass
-
-    def plan(self, environment: Environment) -> (list, int):
-        if not environment.start or not environment.goal:
-            return None, 0
-
-        start = environment.start
-        goal = environment.goal
-        open_set = {(0, start, tuple([start]))}  # Convert list to tuple
-        visited = {}  # Store the shortest distance to each node
+            yield current, step
+
+            y, x = divmod(current, width)
+            for next_x, next_y in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)):
+                if not (0 <= next_x < width and 0 <= next_y < height):
+                    continue
+                neighbor = next_y * width + next_x
+                if not blocked[neighbor] and not visited[neighbor]:
+                    visited[neighbor] = 1
+                    parents[neighbor] = current
+                    stack.append(neighbor)
+
+
+class DijkstraPlanner(SearchPlanner):
+    def __init__(self, sensor=None, field_cache: DistanceFieldCache = None):
+        self.field_cache = field_cache if field_cache is not None else field_cache_instance
+
+    def begin(self, environment: Environment):
+        width = environment.width
+        size = width * environment.height
+        return (environment.start, [math.inf] * size, new_parents(size)), to_index(environment.goal, width)
+
+    def shortest_paths(self, environment: Environment, source=None):
+        """
+        Full single-source Dijkstra over the whole grid.
+
+        Results are kept in the planner's DistanceFieldCache, so asking again for the same
+        source on an unchanged map returns the cached arrays (read-only) without searching.
+
+        Args:
+            environment: The Environment object.
+            source: (x, y) cell to start from; defaults to environment.start.
+
+        Returns:
+            A (height, width) float64 array of distances (inf where unreachable) and a
+            (height, width) int32 array holding each cell's predecessor as a flat index (-1 if none).
+        """
+        source = source if source is not None else environment.start
+        width, height = environment.width, environment.height
+
+        def compute():
+            distances = [math.inf] * (width * height)
+            parents = new_parents(width * height)
+            for _ in self.expand(environment, source, distances, parents):
+                pass
+            return (np.array(distances, dtype=np.float64).reshape(height, width),
+                    np.frombuffer(parents, dtype=np.int32).reshape(height, width).copy())
+
+        key = self.field_cache.key(environment, "dijkstra", to_index(source, width))
+        return self.field_cache.get_or_compute(key, compute)
+
+    def expand(self, environment: Environment, source, distances, parents):
+        """
+        Binary-heap Dijkstra over flat cell indices.
+
+        Moving into a cell costs `environment.costs` at that cell (1 when the environment has
+        no cost layer). Fills `distances` and `parents` in place and yields (cell_index, step)
+        for every settled cell; outdated heap entries are skipped when popped.
+        """
+        width, height = environment.width, environment.height
+        blocked = environment.occupancy.tobytes()
+        costs = environment.costs.ravel().tolist() if environment.costs is not None else None
+
+        start = to_index(source, width)
+        distances[start] = 0
+        open_heap = [(0, start)]
         step = 0
 
-        while open_set:
-            cost, current, path_tuple = min(open_set, key=lambda item: item[0])
-            open_set.remove((cost, current, path_tuple))
+        while open_heap:
+            cost, current = heapq.heappop(open_heap)
+            if cost > distances[current]:
+                continue  # Stale entry
             step += 1
-            path = list(path_tuple)  # Convert back to list for yielding
-            yield path, step
-
-            if current in visited and visited[current] <= cost:
-                continue
-            visited[current] = cost
-
-            if current == goal:
-                return path, step
-
-            for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-                next_x, next_y = current[0] + dx, current[1] + dy
-                neighbor = (next_x, next_y)
-
-                if environment.is_valid(next_x, next_y):
-                    new_cost = cost + 1  # Assuming uniform cost
-                    new_path_tuple = tuple(list(path_tuple) + [neighbor])
-                    if neighbor not in visited or new_cost < visited[neighbor]:
-                        open_set.add((new_cost, neighbor, new_path_tuple))
-
-        return None, step  # No path found
-
-
-class AStarPlanner(MotionPlanner):
+            yield current, step
+
+            y, x = divmod(current, width)
+            for neighbor_x, neighbor_y in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)):
+                if not (0 <= neighbor_x < width and 0 <= neighbor_y < height):
+                    continue
+                neighbor = neighbor_y * width + neighbor_x
+                if blocked[neighbor]:
+                    continue
+                new_cost = cost + (costs[neighbor] if costs is not None else 1)
+                if new_cost < distances[neighbor]:
+                    distances[neighbor] = new_cost
+                    parents[neighbor] = current
+                    heapq.heappush(open_heap, (new_cost, neighbor))
+
+
+class AStarPlanner(SearchPlanner):
     def __init__(self, sensor=None, heuristic_weight=1.0):
         super().__init__()
         self.heuristic_weight = heuristic_weight
 
-    def heuristic(self, a, b):
-        # Manhattan distance heuristic
-        return abs(a[0] - b[0]) + abs(a[1] - b[1])
-
-    def plan(self, environment: Environment) -> (list, int):
-        if not environment.start or not environment.goal:
-            return None, 0  # End the generator cleanly with a return
-
-        start = environment.start
+    def begin(self, environment: Environment):
+        width = environment.width
+        size = width * environment.height
+        return ([math.inf] * size, new_parents(size)), to_index(environment.goal, width)
+
+    def expand(self, environment: Environment, g_score, parents):
+        """
+        Binary-heap A* over flat cell indices.
+
+        Fills `g_score` and `parents` in place and yields (cell_index, step) for every node
+        expanded. Outdated heap entries are skipped when popped (lazy deletion) instead of
+        being removed when a shorter route to their cell is found.
+        """
+        width, height = environment.width, environment.height
+        blocked = environment.occupancy.tobytes()
         goal = environment.goal
-        open_set = {(self.heuristic(start, goal), 0, start, tuple([start]))}
-        g_score = {start: 0}
+        heuristic = self.heuristic
+        weight = self.heuristic_weight
+
+        start = to_index(environment.start, width)
+        g_score[start] = 0
+        # Heap entries are (f, -g, cell); on equal f the deeper node is expanded first
+        open_heap = [(weight * heuristic(environment.start, goal), 0, start)]
         step = 0
 
-        while open_set:
-            _, current_g_score, current, path_tuple = min(open_set, key=lambda item: item[0])
-            open_set.remove((_, current_g_score, current, path_tuple))
+        while open_heap:
+            _, neg_g, current = heapq.heappop(open_heap)
+            current_g_score = -neg_g
+            if current_g_score > g_score[current]:
+                continue  # Stale entry
             step += 1
-            path = list(path_tuple)
-            yield path, step  # Consistently yield path and step
-
-            if current == goal:
-                return  # End the generator cleanly
-
-            for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-                neighbor_x, neighbor_y = current[0] + dx, current[1] + dy
-                neighbor = (neighbor_x, neighbor_y)
-
-                if environment.is_valid(neighbor_x, neighbor_y):
-                    tentative_g_score = current_g_score + 1
-                    if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
-                        g_score[neighbor] = tentative_g_score
-                        f_score = tentative_g_score + self.heuristic_weight * self.heuristic(neighbor, goal)
-                        new_path_tuple = tuple(list(path_tuple) + [neighbor])
-                        open_set.add((f_score, tentative_g_score, neighbor, new_path_tuple))
-
-        return None, step
+            yield current, step
+
+            y, x = divmod(current, width)
+            tentative_g_score = current_g_score + 1
+            for neighbor_x, neighbor_y in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)):
+                if not (0 <= neighbor_x < width and 0 <= neighbor_y < height):
+                    continue
+                neighbor = neighbor_y * width + neighbor_x
+                if blocked[neighbor] or tentative_g_score >= g_score[neighbor]:
+                    continue
+                g_score[neighbor] = tentative_g_score
+                parents[neighbor] = current
+                f_score = tentative_g_score + weight * heuristic((neighbor_x, neighbor_y), goal)
+                heapq.heappush(open_heap, (f_score, -tentative_g_score, neighbor))
@@ -0,0 +1,159 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from src.core.algorithms.search_algorithms import AStarPlanner
+from src.core.environment import Environment
+from src.core.motion_planner import TRACE_NONE
+
+# State of a worker process, set up once by _init_worker
+_worker_environment = None
+_worker_planner = None
+
+
+class BatchResult:
+    """
+    Results of plan_batch in a packed, ragged layout.
+
+    Attributes:
+        path_cells: (total_cells, 2) int32 array with the (x, y) cells of every path, back to back.
+        path_offsets: (N + 1,) int64 array; path i is path_cells[path_offsets[i]:path_offsets[i + 1]].
+        path_lengths: (N,) int32 array of path lengths in cells, -1 where no path was found.
+        expansions: (N,) int64 array of planner steps per query.
+        elapsed: (N,) float64 array of planning time per query, in seconds.
+    """
+
+    def __init__(self, path_cells, path_offsets, path_lengths, expansions, elapsed):
+        self.path_cells = path_cells
+        self.path_offsets = path_offsets
+        self.path_lengths = path_lengths
+        self.expansions = expansions
+        self.elapsed = elapsed
+
+    def __len__(self):
+        return len(self.path_lengths)
+
+    def path(self, i):
+        """Returns path i as a list of (x, y) tuples, or None if the query had no path."""
+        if self.path_lengths[i] < 0:
+            return None
+        return [tuple(cell) for cell in self.path_cells[self.path_offsets[i]:self.path_offsets[i + 1]].tolist()]
+
+
+def run_to_completion(planner, environment: Environment):
+    """
+    Runs a planner on the environment's current start and goal without keeping intermediate steps.
+
+    Uses the planner's find_path() when it has one and otherwise drains its plan() generator with
+    tracing turned off.
+
+    Returns:
+        The final path (or None) and the number of steps taken.
+    """
+    if hasattr(planner, "find_path"):
+        return planner.find_path(environment)
+
+    path, step = None, 0
+    generator = planner.set_trace(TRACE_NONE).plan(environment)
+    try:
+        while True:
+            result = next(generator)
+            path, step = result[0], result[1]
+    except StopIteration as stop:
+        if stop.value is not None:
+            path, step = stop.value[0], stop.value[1]
+    if path and (round(path[-1][0]), round(path[-1][1])) != tuple(environment.goal):
+        path = None  # The planner stopped without reaching the goal
+    return path, step
+
+
+def _init_worker(memory_name, packed_shape, width, height, costs, planner_class, planner_kwargs):
+    global _worker_environment, _worker_planner
+    memory = shared_memory.SharedMemory(name=memory_name)
+    try:
+        packed = np.ndarray(packed_shape, dtype=np.uint8, buffer=memory.buf)
+        environment = Environment(width, height)
+        environment.load_packed_occupancy(packed, width, height)
+    finally:
+        memory.close()
+    environment.costs = costs
+    _worker_environment = environment
+    _worker_planner = planner_class(**planner_kwargs)
+
+
+def _plan_chunk(queries):
+    return _plan_queries(_worker_environment, _worker_planner, queries)
+
+
+def _plan_queries(environment: Environment, planner, queries):
+    paths = []
+    lengths = np.full(len(queries), -1, dtype=np.int32)
+    expansions = np.zeros(len(queries), dtype=np.int64)
+    elapsed = np.zeros(len(queries), dtype=np.float64)
+
+    for i, (start_x, start_y, goal_x, goal_y) in enumerate(queries.tolist()):
+        environment.set_start(start_x, start_y)
+        environment.set_goal(goal_x, goal_y)
+        began = time.perf_counter()
+        path, step = run_to_completion(planner, environment)
+        elapsed[i] = time.perf_counter() - began
+        expansions[i] = step
+        if path is not None:
+            lengths[i] = len(path)
+            paths.append(np.asarray(path, dtype=np.int32).reshape(-1, 2))
+
+    cells = np.concatenate(paths) if paths else np.zeros((0, 2), dtype=np.int32)
+    return cells, lengths, expansions, elapsed
+
+
+def plan_batch(environment: Environment, queries, workers=None, planner_class=AStarPlanner, planner_kwargs=None,
+               chunk_size=None) -> BatchResult:
+    """
+    Plans many start/goal pairs on one environment, optionally across worker processes.
+
+    The occupancy grid is bit-packed into a shared memory block that every worker reads once at
+    start-up, so each worker keeps one private Environment (and one planner, with whatever it
+    caches) for all the queries it gets. The shared environment's start and goal are left untouched.
+
+    Args:
+        environment: The Environment to plan on.
+        queries: Array-like of shape (N, 4) with (start_x, start_y, goal_x, goal_y) rows.
+        workers: Number of worker processes; defaults to the CPU count. 1 plans in this process.
+        planner_class: MotionPlanner class to plan with.
+        planner_kwargs: Keyword arguments for planner_class.
+        chunk_size: Queries sent to a worker at a time; defaults to about four chunks per worker.
+
+    Returns:
+        A BatchResult with the paths and per-query statistics, in query order.
+    """
+    queries = np.asarray(queries, dtype=np.int64).reshape(-1, 4)
+    planner_kwargs = planner_kwargs or {}
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(queries) <= 1:
+        local_environment = Environment(environment.width, environment.height)
+        local_environment.occupancy = environment.occupancy.copy()
+        local_environment.costs = environment.costs
+        chunks = [_plan_queries(local_environment, planner_class(**planner_kwargs), queries)]
+    else:
+        chunk_size = chunk_size or max(1, -(-len(queries) // (workers * 4)))
+        packed = environment.packed_occupancy()
+        memory = shared_memory.SharedMemory(create=True, size=max(packed.nbytes, 1))
+        try:
+            np.ndarray(packed.shape, dtype=np.uint8, buffer=memory.buf)[:] = packed
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(memory.name, packed.shape, environment.width, environment.height,
+                                               environment.costs, planner_class, planner_kwargs)) as executor:
+                chunks = list(executor.map(_plan_chunk,
+                                           [queries[i:i + chunk_size] for i in range(0, len(queries), chunk_size)]))
+        finally:
+            memory.close()
+            memory.unlink()
+
+    path_cells, path_lengths, expansions, elapsed = (np.concatenate(arrays) for arrays in zip(*chunks))
+    path_offsets = np.zeros(len(path_lengths) + 1, dtype=np.int64)
+    np.cumsum(np.maximum(path_lengths, 0), out=path_offsets[1:])
+    return BatchResult(path_cells, path_offsets, path_lengths, expansions, elapsed)
@@ -1,17 +1,179 @@
+import functools
+import hashlib
+import inspect
+import math
+import weakref
+from collections.abc import MutableSet
+
+import numpy as np
+
 from src.config import config_instance as CONFIG
 
 
+class ObstacleSet(MutableSet):
+    """
+    Set-like view of the obstacle cells stored in an Environment's occupancy grid.
+
+    Behaves like the set of (x, y) tuples the environment used to keep, so code that adds,
+    removes, iterates or tests membership on `environment.obstacles` keeps working while the
+    data itself lives in a dense uint8 array.
+    """
+
+    def __init__(self, environment):
+        self._environment = environment
+
+    def __contains__(self, position):
+        try:
+            x, y = position
+        except (TypeError, ValueError):
+            return False
+        return self._environment.is_obstacle(x, y)
+
+    def __iter__(self):
+        # argwhere takes a snapshot, so the set can be modified while iterating
+        for y, x in np.argwhere(self._environment.occupancy).tolist():
+            yield x, y
+
+    def __len__(self):
+        return int(np.count_nonzero(self._environment.occupancy))
+
+    def __repr__(self):
+        return f"ObstacleSet({set(self)!r})"
+
+    def add(self, position):
+        self._environment.add_obstacle(*position)
+
+    def discard(self, position):
+        self._environment.remove_obstacle(*position)
+
+    def clear(self):
+        self._environment.occupancy[:] = 0
+        self._environment.notify_changed()
+
+
 class Environment:
     def __init__(self, width, height):
-        self.width = width
-        self.height = height
-        self.obstacles = set()
+        # Occupancy grid indexed as [y, x]; 1 marks an obstacle cell
+        self.occupancy = np.zeros((height, width), dtype=np.uint8)
+        # Optional per-cell cost of entering a cell (e.g. terrain weights); None means uniform cost 1
+        self.costs = None
         self.start = None
         self.goal = None
+        # Bumped on every change to the grid so derived data (search graphs, distance fields, ...)
+        # can tell whether it is stale
+        self.version = 0
+        self._change_listeners = []
+        # Derived planning data cached against this environment, keyed by its owner
+        self.planning_cache = {}
+        self._content_hash = None  # (stamp, digest) of the last content_hash() call
         self.add_boundary()
 
+    @property
+    def width(self):
+        return self.occupancy.shape[1]
+
+    @width.setter
+    def width(self, value):
+        self.resize(value, self.height)
+
+    @property
+    def height(self):
+        return self.occupancy.shape[0]
+
+    @height.setter
+    def height(self, value):
+        self.resize(self.width, value)
+
+    @property
+    def obstacles(self):
+        return ObstacleSet(self)
+
+    @obstacles.setter
+    def obstacles(self, positions):
+        if isinstance(positions, ObstacleSet) and positions._environment is self:
+            return  # `obstacles |= ...` and friends already edited the grid in place
+        positions = list(positions)  # The positions may be read from the grid being cleared
+        self.occupancy[:] = 0
+        for x, y in positions:
+            if self.in_bounds(x, y):
+                self.occupancy[int(y), int(x)] = 1
+        self.notify_changed()
+
+    def add_change_listener(self, listener):
+        """
+        Registers a callable that is told about every change to the grid.
+
+        The listener receives a list of changed (x, y) cells, or None when the whole grid may
+        have changed (bulk edits, resizing, loading). Bound methods are held weakly, so a
+        planner listening to the environment is dropped with the planner.
+        """
+        if inspect.ismethod(listener):
+            listener = weakref.WeakMethod(listener)
+        # Drop the listeners of collected owners, in case nothing was edited since
+        self._change_listeners = [entry for entry in self._change_listeners
+                                  if not isinstance(entry, weakref.WeakMethod) or entry() is not None]
+        self._change_listeners.append(listener)
+
+    def remove_change_listener(self, listener):
+        for entry in list(self._change_listeners):
+            if (entry() if isinstance(entry, weakref.WeakMethod) else entry) == listener:
+                self._change_listeners.remove(entry)
+
+    def notify_changed(self, cells=None):
+        self.version += 1
+        for entry in list(self._change_listeners):
+            listener = entry() if isinstance(entry, weakref.WeakMethod) else entry
+            if listener is None:
+                self._change_listeners.remove(entry)  # Its owner was garbage collected
+            else:
+                listener(cells)
+
+    def resize(self, width, height):
+        """Resizes the grid, keeping the obstacles that still fit inside it."""
+        occupancy = np.zeros((height, width), dtype=np.uint8)
+        keep_h, keep_w = min(height, self.height), min(width, self.width)
+        occupancy[:keep_h, :keep_w] = self.occupancy[:keep_h, :keep_w]
+        self.occupancy = occupancy
+        if self.costs is not None:
+            costs = np.ones((height, width), dtype=np.float32)
+            costs[:keep_h, :keep_w] = self.costs[:keep_h, :keep_w]
+            self.costs = costs
+        self.notify_changed()
+
+    def in_bounds(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height
+
     def add_obstacle(self, x, y):
-        self.obstacles.add((x, y))
+        if self.in_bounds(x, y) and not self.occupancy[int(y), int(x)]:
+            self.occupancy[int(y), int(x)] = 1
+            self.notify_changed([(int(x), int(y))])
+
+    def remove_obstacle(self, x, y):
+        if self.in_bounds(x, y) and self.occupancy[int(y), int(x)]:
+            self.occupancy[int(y), int(x)] = 0
+            self.notify_changed([(int(x), int(y))])
+
+    def set_cost(self, x, y, cost):
+        if cost < 0:
+            raise ValueError("Traversal cost must be non-negative")
+        if self.costs is None:
+            self.costs = np.ones((self.height, self.width), dtype=np.float32)
+        if self.in_bounds(x, y):
+            self.costs[int(y), int(x)] = cost
+            self.notify_changed([(int(x), int(y))])
+
+    def cost_at(self, x, y):
+        return 1.0 if self.costs is None else float(self.costs[int(y), int(x)])
+
+    def clear_costs(self):
+        self.costs = None
+        self.notify_changed()
+
+    def is_obstacle(self, x, y):
+        # Only whole cell coordinates can hold an obstacle
+        if not self.in_bounds(x, y) or int(x) != x or int(y) != y:
+            return False
+        return bool(self.occupancy[int(y), int(x)])
 
     def set_start(self, x, y):
         self.start = (x, y)
@@ -20,13 +182,110 @@ class Environment:
         self.goal = (x, y)
 
     def is_valid(self, x, y):
-        return 0 <= x < self.width and 0 <= y < self.height and (x, y) not in self.obstacles
+        return self.in_bounds(x, y) and not self.is_obstacle(x, y)
+
+    def is_valid_many(self, positions):
+        """
+        Vectorized version of is_valid.
+
+        Args:
+            positions: Array-like of shape (N, 2) holding (x, y) coordinates.
+
+        Returns:
+            A boolean NumPy array of length N.
+        """
+        positions = np.asarray(positions)
+        if positions.size == 0:
+            return np.zeros(0, dtype=bool)
+        positions = positions.reshape(-1, 2)
+        x, y = positions[:, 0], positions[:, 1]
+        valid = (x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)
+        ix = np.where(valid, x, 0).astype(np.intp)
+        iy = np.where(valid, y, 0).astype(np.intp)
+        # Non-integer positions never coincide with an obstacle cell, as in is_valid
+        on_cell = (ix == x) & (iy == y)
+        valid &= ~(on_cell & (self.occupancy[iy, ix] != 0))
+        return valid
+
+    def obstacle_window(self, center, radius):
+        """
+        Finds the obstacle cells within Euclidean distance `radius` of `center`.
+
+        Only the occupancy cells of the bounding square of the disc are read, so a query costs
+        O(radius^2) however many obstacles the map holds. The disc masks of whole-cell centers
+        are precomputed per radius.
+
+        Returns:
+            A boolean mask of the obstacles in range and the (x0, y0) grid cell of its first
+            column and row.
+        """
+        disc, x0, y0 = self.disc_window(center, radius)
+        window = self.occupancy[y0:y0 + disc.shape[0], x0:x0 + disc.shape[1]] != 0
+        return window & disc, x0, y0
+
+    def disc_window(self, center, radius):
+        """
+        Returns the boolean mask of the grid cells within Euclidean distance `radius` of `center`,
+        cropped to the grid, and the (x0, y0) grid cell of its first column and row.
+        """
+        cx, cy = center
+        x0 = max(int(math.floor(cx - radius)), 0)
+        y0 = max(int(math.floor(cy - radius)), 0)
+        x1 = min(int(math.ceil(cx + radius)), self.width - 1)
+        y1 = min(int(math.ceil(cy + radius)), self.height - 1)
+        if x0 > x1 or y0 > y1:
+            return np.zeros((0, 0), dtype=bool), x0, y0
+
+        if int(cx) == cx and int(cy) == cy:
+            disc = self.disc_stencil(radius)
+            reach = disc.shape[0] // 2
+            # Crop the stencil like the window is cropped at the grid border
+            disc = disc[y0 - int(cy) + reach:y1 - int(cy) + reach + 1, x0 - int(cx) + reach:x1 - int(cx) + reach + 1]
+        else:
+            ys, xs = np.ogrid[y0:y1 + 1, x0:x1 + 1]
+            disc = (xs - cx) ** 2 + (ys - cy) ** 2 <= radius ** 2
+        return disc, x0, y0
+
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def disc_stencil(radius):
+        """Returns the (2R + 1, 2R + 1) boolean mask of the offsets within `radius` of a cell, R = ceil(radius)."""
+        reach = int(math.ceil(radius))
+        offsets = np.arange(-reach, reach + 1)
+        stencil = offsets[None, :] ** 2 + offsets[:, None] ** 2 <= radius ** 2
+        stencil.setflags(write=False)  # Shared by every query with this radius
+        return stencil
+
+    def content_hash(self):
+        """
+        Returns a hex digest of the grid size, obstacles and costs, stable across runs and copies.
+
+        The digest is remembered until the version changes (or the arrays are replaced), so
+        repeated calls on an unchanged environment are free.
+        """
+        stamp = (self.version, id(self.occupancy), id(self.costs))
+        if self._content_hash is not None and self._content_hash[0] == stamp:
+            return self._content_hash[1]
+        digest = hashlib.sha1(np.array(self.occupancy.shape, dtype=np.int64).tobytes())
+        digest.update(self.packed_occupancy().tobytes())
+        if self.costs is not None:
+            digest.update(self.costs.tobytes())
+        self._content_hash = (stamp, digest.hexdigest())
+        return self._content_hash[1]
+
+    def packed_occupancy(self):
+        """Returns the occupancy grid bit-packed along rows (1 bit per cell)."""
+        return np.packbits(self.occupancy, axis=1)
+
+    def load_packed_occupancy(self, packed, width, height):
+        self.occupancy = np.unpackbits(packed, axis=1, count=width)[:height].astype(np.uint8)
+        self.notify_changed()
 
     def add_boundary(self):
         print("Adding boundary") if CONFIG.debug else None
-        for i in range(self.width):
-            self.obstacles.add((i, 0))
-            self.obstacles.add((i, self.height - 3))
-        for i in range(self.height - 3):
-            self.obstacles.add((0, i))
-            self.obstacles.add((self.width - 1, i))
+        self.occupancy[0, :] = 1
+        if self.height >= 3:
+            self.occupancy[self.height - 3, :] = 1
+        self.occupancy[:max(self.height - 3, 0), 0] = 1
+        self.occupancy[:max(self.height - 3, 0), self.width - 1] = 1
+        self.notify_changed()
@@ -0,0 +1,81 @@
+from collections import OrderedDict
+
+from src.core.environment import Environment
+
+
+class DistanceFieldCache:
+    """
+    Least-recently-used cache of distance and flow fields within a memory budget.
+
+    Fields are keyed by the environment's content hash plus whatever identifies the field
+    (planner, mode, goal or source cells), so every query on an unchanged map shares one field
+    no matter which Environment object it comes from, and editing the map makes old entries
+    unreachable until they are evicted. Cached arrays are returned read-only.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (value, nbytes), least recently used first
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @staticmethod
+    def key(environment: Environment, *parts):
+        """Builds a cache key for a field of `environment` identified by `parts`."""
+        return (environment.content_hash(),) + parts
+
+    def get(self, key):
+        """Returns the cached field for `key` (marking it as recently used), or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value):
+        """
+        Stores a field (an array or a tuple of arrays) and evicts the least recently used ones
+        until the cache fits its budget again. Fields larger than the whole budget are not kept.
+
+        Returns:
+            The value with its arrays made read-only.
+        """
+        arrays = value if isinstance(value, tuple) else (value,)
+        for array in arrays:
+            array.setflags(write=False)
+        size = sum(array.nbytes for array in arrays)
+
+        if key in self._entries:
+            self.nbytes -= self._entries.pop(key)[1]
+        if size <= self.max_bytes:
+            self._entries[key] = (value, size)
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.nbytes -= evicted_size
+        return value
+
+    def get_or_compute(self, key, compute):
+        """Returns the cached field for `key`, calling `compute()` and caching its result on a miss."""
+        value = self.get(key)
+        if value is None:
+            value = self.put(key, compute())
+        return value
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
+
+
+# Cache shared by the planners unless they are given their own
+field_cache_instance = DistanceFieldCache()
+
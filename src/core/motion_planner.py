@@ -1,9 +1,19 @@
 from abc import ABC, abstractmethod
 
 from src.core.environment import Environment
+from src.utils.grid import manhattan, new_parents, reconstruct_path, to_index
+
+# Trace levels: how much intermediate state plan() generators yield
+TRACE_NONE = "none"  # Only the final result
+TRACE_SAMPLED = "sampled"  # Every trace_interval-th step, plus the final result
+TRACE_FULL = "full"  # Every step
+TRACE_LEVELS = (TRACE_NONE, TRACE_SAMPLED, TRACE_FULL)
 
 
 class MotionPlanner(ABC):
+    trace_level = TRACE_FULL
+    trace_interval = 1
+
     @abstractmethod
     def plan(self, environment: Environment) -> (list, int):
         """
@@ -15,4 +25,110 @@ class MotionPlanner(ABC):
         Returns:
             A list of (x, y) tuples representing the path, or None if no path is found.
         """
-        pass
\ No newline at end of file
+        pass
+
+    def set_trace(self, level, interval=1):
+        """
+        Sets how much intermediate state plan() yields.
+
+        Planners skip building intermediate paths (and grids) for steps that are not traced, so
+        TRACE_NONE makes plan() about as cheap as a result-only search.
+
+        Args:
+            level: TRACE_NONE, TRACE_SAMPLED or TRACE_FULL.
+            interval: Steps between yields for TRACE_SAMPLED.
+
+        Returns:
+            The planner itself, so calls can be chained.
+        """
+        if level not in TRACE_LEVELS:
+            raise ValueError(f"Unknown trace level {level!r}, expected one of {TRACE_LEVELS}")
+        if interval < 1:
+            raise ValueError("Trace interval must be at least 1")
+        self.trace_level = level
+        self.trace_interval = interval
+        return self
+
+    def traces(self, step) -> bool:
+        """Returns True if the intermediate state after `step` should be yielded."""
+        if self.trace_level == TRACE_FULL:
+            return True
+        if self.trace_level == TRACE_NONE:
+            return False
+        return step % self.trace_interval == 0
+
+
+class SearchPlanner(MotionPlanner):
+    """
+    Base for planners that search with an expand() generator until the goal is expanded.
+
+    Subclasses supply expand(environment, *search), yielding (node, step) for every expanded
+    node, and override begin() when their search needs more state than a flat parent array.
+    plan() and find_path() drive the search; trace_path() and result_path() turn a node into
+    the intermediate and final path.
+    """
+
+    def heuristic(self, a, b):
+        return manhattan(a, b)
+
+    def begin(self, environment: Environment):
+        """
+        Sets up one search.
+
+        Returns:
+            The extra arguments of expand() as a tuple, and the goal node to stop at. By default
+            a flat parent array for a search over flat cell indices.
+        """
+        width = environment.width
+        return (new_parents(width * environment.height),), to_index(environment.goal, width)
+
+    def trace_path(self, environment: Environment, search, node):
+        """Returns the path to `node` found so far; by default follows the flat parent array last in `search`."""
+        return reconstruct_path(search[-1], node, environment.width)
+
+    def result_path(self, environment: Environment, search, node):
+        """Returns the final path once the goal `node` is expanded; the traced path by default."""
+        return self.trace_path(environment, search, node)
+
+    def plan(self, environment: Environment) -> (list, int):
+        if not environment.start or not environment.goal:
+            return None, 0
+
+        search, goal = self.begin(environment)
+        step = 0
+
+        traces = self.traces
+
+        for current, step in self.expand(environment, *search):
+            if current == goal:
+                path = self.result_path(environment, search, current)
+                yield path, step
+                return path, step
+
+            if traces(step):
+                yield self.trace_path(environment, search, current), step
+
+        return None, step  # No path found
+
+    def find_path(self, environment: Environment) -> (list, int):
+        """
+        Runs the search to completion without building intermediate paths.
+
+        Returns:
+            The path as a list of (x, y) tuples (or None) and the number of expansions.
+        """
+        if not environment.start or not environment.goal:
+            return None, 0
+
+        search, goal = self.begin(environment)
+        step = 0
+
+        for current, step in self.expand(environment, *search):
+            if current == goal:
+                return self.result_path(environment, search, current), step
+
+        return None, step
+
+    @abstractmethod
+    def expand(self, environment: Environment, *search):
+        pass
@@ -0,0 +1,157 @@
+import math
+
+import numpy as np
+
+from src.core.environment import Environment
+
+
+class MultiAgentPotentialField:
+    """
+    Moves many agents towards their goals with potential fields, one NumPy step for all of them.
+
+    Every agent follows the same rule as PotentialFieldPlanner: the attractive pull of its goal
+    plus the repulsion of obstacle cells closer than min_repulsive_distance, normalized to a
+    step of step_size. With agent_repulsion_gain > 0, agents closer than agent_radius to each
+    other also push apart; nearby agents are found through a uniform neighbor grid, so the cost
+    grows with the number of close pairs rather than with N^2.
+    """
+
+    def __init__(self, attractive_gain=5.0, repulsive_gain=100.0, min_repulsive_distance=2.0, step_size=0.1,
+                 agent_repulsion_gain=0.0, agent_radius=1.0, max_steps=1000):
+        self.attractive_gain = attractive_gain  # Gain for attractive force
+        self.repulsive_gain = repulsive_gain  # Gain for obstacle repulsion
+        self.min_repulsive_distance = min_repulsive_distance  # Obstacles farther away than this are ignored
+        self.step_size = step_size  # Distance an agent moves per tick
+        self.agent_repulsion_gain = agent_repulsion_gain  # Gain for agent-agent repulsion, 0 to disable
+        self.agent_radius = agent_radius  # Agents farther apart than this do not repel each other
+        self.max_steps = max_steps
+
+    def simulate(self, environment: Environment, starts, goals):
+        """
+        Runs the simulation, yielding after every tick.
+
+        Args:
+            environment: The Environment object.
+            starts: Array-like of shape (N, 2) with the (x, y) start of every agent.
+            goals: Array-like of shape (N, 2) with the (x, y) goal of every agent.
+
+        Yields:
+            (positions, tick, active): a fresh (N, 2) float64 array of agent positions, the tick
+            number and a boolean array of the agents still moving. Agents stop when they are
+            within step_size of their goal or when their next step would collide.
+        """
+        positions = np.asarray(starts, dtype=np.float64).reshape(-1, 2).copy()
+        goals = np.asarray(goals, dtype=np.float64).reshape(-1, 2)
+        active = np.linalg.norm(goals - positions, axis=1) > self.step_size
+        tick = 0
+        yield positions.copy(), tick, active.copy()
+
+        while active.any() and tick < self.max_steps:
+            tick += 1
+            moving = np.flatnonzero(active)
+            force = self.attractive_forces(positions[moving], goals[moving])
+            force += self.obstacle_forces(positions[moving], environment)
+            if self.agent_repulsion_gain:
+                force += self.agent_forces(positions)[moving]
+
+            # Normalize the force
+            magnitude = np.hypot(force[:, 0], force[:, 1])
+            np.divide(force, magnitude[:, None], out=force, where=magnitude[:, None] > 0)
+            new_positions = positions[moving] + force * self.step_size
+
+            # Agents whose step would collide stop where they are
+            valid = environment.is_valid_many(new_positions)
+            positions[moving[valid]] = new_positions[valid]
+            active[moving[~valid]] = False
+            active[moving] &= np.linalg.norm(goals[moving] - positions[moving], axis=1) > self.step_size
+
+            yield positions.copy(), tick, active.copy()
+
+    def attractive_forces(self, positions, goals):
+        return self.attractive_gain * (goals - positions)
+
+    def obstacle_forces(self, positions, environment: Environment):
+        """Sums the repulsion of the obstacle cells within min_repulsive_distance of every position."""
+        force = np.zeros_like(positions)
+        cells = np.floor(positions).astype(np.int64)
+        reach = int(math.ceil(self.min_repulsive_distance))
+        # Every cell within min_repulsive_distance of a position lies in this window around its cell
+        for dy in range(-reach, reach + 2):
+            for dx in range(-reach, reach + 2):
+                x = cells[:, 0] + dx
+                y = cells[:, 1] + dy
+                inside = (x >= 0) & (x < environment.width) & (y >= 0) & (y < environment.height)
+                blocked = np.zeros(len(positions), dtype=bool)
+                blocked[inside] = environment.occupancy[y[inside], x[inside]] != 0
+                if not blocked.any():
+                    continue
+
+                offsets = positions[blocked] - np.column_stack((x[blocked], y[blocked]))
+                distances = np.hypot(offsets[:, 0], offsets[:, 1])
+                near = (distances <= self.min_repulsive_distance) & (distances > 0)
+                distances = distances[near]
+                magnitudes = self.repulsive_gain * (1.0 / distances - 1.0 / self.min_repulsive_distance) / (
+                        distances ** 2)
+                force[np.flatnonzero(blocked)[near]] += offsets[near] * (magnitudes / distances)[:, None]
+        return force
+
+    def agent_forces(self, positions):
+        """Sums the repulsion between every pair of agents closer than agent_radius."""
+        first, second = self.neighbor_pairs(positions, self.agent_radius)
+        force = np.zeros_like(positions)
+        if len(first) == 0:
+            return force
+
+        offsets = positions[first] - positions[second]
+        distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        near = (distances < self.agent_radius) & (distances > 0)
+        distances = distances[near]
+        magnitudes = self.agent_repulsion_gain * (1.0 / distances - 1.0 / self.agent_radius) / (distances ** 2)
+        np.add.at(force, first[near], offsets[near] * (magnitudes / distances)[:, None])
+        return force
+
+    @staticmethod
+    def neighbor_pairs(positions, radius):
+        """
+        Finds candidate pairs of positions closer than `radius` with a uniform bucket grid.
+
+        Positions are bucketed into square cells of side `radius` and sorted by bucket, so the
+        agents of any bucket form one contiguous run; every agent is then paired with the runs
+        of its own and the eight surrounding buckets.
+
+        Returns:
+            Two int64 arrays (first, second) of agent indices, each unordered pair appearing in
+            both orders. Pairs may be farther apart than `radius` and need a distance check.
+        """
+        count = len(positions)
+        if count < 2:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        buckets = np.floor(positions / radius).astype(np.int64)
+        buckets -= buckets.min(axis=0) - 1  # Leave a margin so neighboring buckets never wrap
+        rows = int(buckets[:, 1].max()) + 2
+        keys = buckets[:, 0] * rows + buckets[:, 1]
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+
+        first, second = [], []
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                neighbor_keys = keys + dx * rows + dy
+                lower = np.searchsorted(sorted_keys, neighbor_keys, side="left")
+                counts = np.searchsorted(sorted_keys, neighbor_keys, side="right") - lower
+                total = int(counts.sum())
+                if total == 0:
+                    continue
+                # Expand every (agent, run) into one entry per agent in the run
+                agents = np.repeat(np.arange(count), counts)
+                run_starts = np.repeat(lower, counts)
+                within_run = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+                partners = order[run_starts + within_run]
+                distinct = agents != partners
+                first.append(agents[distinct])
+                second.append(partners[distinct])
+
+        if not first:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return np.concatenate(first), np.concatenate(second)
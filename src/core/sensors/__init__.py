@@ -1,3 +1,6 @@
-from .sensor_model import SensorModel
+from .occupancy_map import OccupancyMap
+from .registry import SensorPlugin, SensorRegistry, sensor_class_in, sensor_registry_instance
+from .sensor_model import ObstacleWindow, SensorModel, obstacle_lookup
 
-__all__ = ["SensorModel"]
\ No newline at end of file
+__all__ = ["SensorModel", "ObstacleWindow", "obstacle_lookup", "OccupancyMap", "SensorRegistry", "SensorPlugin",
+           "sensor_class_in", "sensor_registry_instance"]
\ No newline at end of file
@@ -1 +1,3 @@
+from .fov_sensor import FieldOfViewSensor
+from .lidar_sensor import LidarSensor
 from .range_sensor import RangeSensor
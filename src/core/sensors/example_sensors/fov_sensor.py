@@ -0,0 +1,148 @@
+import functools
+import math
+
+import numpy as np
+
+from src.core.sensors.sensor_model import ObstacleWindow, SensorModel
+
+# (primary, secondary) axes of the eight octants: the cell at depth d and column c of an
+# octant is at offset d * primary + c * secondary from the agent
+OCTANTS = (((1, 0), (0, 1)), ((1, 0), (0, -1)), ((-1, 0), (0, 1)), ((-1, 0), (0, -1)),
+           ((0, 1), (1, 0)), ((0, 1), (-1, 0)), ((0, -1), (1, 0)), ((0, -1), (-1, 0)))
+
+
+class FieldOfViewSensor(SensorModel):
+    """
+    Sees every cell within range_limit that is not hidden behind an obstacle, using symmetric
+    recursive shadowcasting.
+
+    The eight octants are scanned together one row (depth) at a time: every still-open slope
+    interval of every octant is expanded into its cells of the row with array operations, and
+    the runs of free cells between obstacles become the intervals of the next row. A scan
+    therefore costs O(range_limit) array operations over the cells it sees. Cell offsets,
+    row slopes and the range disc are precomputed per range in octant_tables(). Obstacles are
+    opaque and visible themselves; cells outside the grid are opaque and never visible.
+
+    Readings:
+        "visible_cells": ObstacleWindow of every visible cell, the agent's own cell included.
+        "obstacles_in_range": ObstacleWindow of the visible obstacles, a subset of visible_cells.
+    """
+
+    def __init__(self, range_limit=10):
+        self.range_limit = range_limit
+
+    def sense(self, environment, agent_position):
+        visible, x0, y0 = self.visible_window(environment, agent_position)
+        obstacles = visible & (environment.occupancy[y0:y0 + visible.shape[0], x0:x0 + visible.shape[1]] != 0)
+        return {"visible_cells": ObstacleWindow(visible, x0, y0), "obstacles_in_range": ObstacleWindow(obstacles, x0, y0)}
+
+    def observation(self, environment, agent_position):
+        sensor_data = self.reading(environment, agent_position)
+        visible, obstacles = sensor_data["visible_cells"], sensor_data["obstacles_in_range"]
+        return visible.mask, obstacles.mask, visible.x0, visible.y0
+
+    def visible_window(self, environment, agent_position):
+        """
+        Runs the shadowcasting scan from the cell of `agent_position`.
+
+        Returns:
+            A boolean mask of the visible cells, cropped to the grid, and the (x0, y0) grid cell
+            of its first column and row.
+        """
+        offsets, slopes, in_range = self.octant_tables(self.range_limit)
+        reach = slopes.shape[0] - 1
+        cx, cy = round(agent_position[0]), round(agent_position[1])
+        x0, y0 = max(cx - reach, 0), max(cy - reach, 0)
+        x1 = min(cx + reach, environment.width - 1)
+        y1 = min(cy + reach, environment.height - 1)
+        if x0 > x1 or y0 > y1 or not environment.in_bounds(cx, cy):
+            return np.zeros((0, 0), dtype=bool), x0, y0
+
+        # Square window centred on the agent, padded with opaque cells where it leaves the grid
+        size = 2 * reach + 1
+        opaque = np.ones((size, size), dtype=bool)
+        left, top = x0 - (cx - reach), y0 - (cy - reach)
+        opaque[top:top + y1 - y0 + 1, left:left + x1 - x0 + 1] = environment.occupancy[y0:y1 + 1, x0:x1 + 1] != 0
+        visible = np.zeros((size, size), dtype=bool)
+        visible[reach, reach] = True
+
+        # Open slope intervals of the current row, for all octants at once
+        octants = np.arange(len(OCTANTS))
+        starts = np.zeros(len(OCTANTS))
+        ends = np.ones(len(OCTANTS))
+        for depth in range(1, reach + 1):
+            # Columns of each interval: round d * start half up and d * end half down
+            first = np.floor(depth * starts + 0.5).astype(np.int64)
+            counts = np.maximum(np.ceil(depth * ends - 0.5).astype(np.int64) - first + 1, 0)
+            total = int(counts.sum())
+            if total == 0:
+                break
+
+            # One entry per cell of every interval
+            interval = np.repeat(np.arange(len(counts)), counts)
+            run_first = np.cumsum(counts) - counts
+            columns = first[interval] + np.arange(total) - run_first[interval]
+            cell_octants = octants[interval]
+            cell_x = offsets[cell_octants, depth, columns, 0]
+            cell_y = offsets[cell_octants, depth, columns, 1]
+            walls = opaque[cell_y, cell_x]
+
+            # Obstacles are always seen; free cells only when the agent's ray to their centre is open
+            symmetric = (columns >= depth * starts[interval]) & (columns <= depth * ends[interval])
+            seen = (walls | symmetric) & in_range[depth, columns]
+            visible[cell_y[seen], cell_x[seen]] = True
+
+            # Every run of free cells continues as an interval of the next row
+            is_first = np.zeros(total, dtype=bool)
+            is_first[run_first[counts > 0]] = True
+            is_last = np.zeros(total, dtype=bool)
+            is_last[(run_first + counts - 1)[counts > 0]] = True
+            free = ~walls
+            previous_wall = np.ones(total, dtype=bool)
+            previous_wall[1:] = walls[:-1]
+            next_wall = np.ones(total, dtype=bool)
+            next_wall[:-1] = walls[1:]
+            opening = np.flatnonzero(free & (is_first | previous_wall))
+            closing = np.flatnonzero(free & (is_last | next_wall))
+            parents = interval[opening]
+            octants = octants[parents]
+            starts = np.where(is_first[opening], starts[parents], slopes[depth, columns[opening]])
+            ends = np.where(is_last[closing], ends[parents], slopes[depth, columns[closing] + 1])
+
+        return visible[top:top + y1 - y0 + 1, left:left + x1 - x0 + 1], x0, y0
+
+    @staticmethod
+    @functools.lru_cache(maxsize=16)
+    def octant_tables(range_limit):
+        """
+        Precomputes the scan tables for one range.
+
+        Returns:
+            offsets: (8, reach + 1, reach + 2, 2) int64 (x, y) window index of the cell at each
+                (octant, depth, column), with the agent at (reach, reach).
+            slopes: (reach + 1, reach + 2) float64 slope (2c - 1) / 2d of the left edge of each cell.
+            in_range: (reach + 1, reach + 2) boolean mask of the cells within range_limit.
+        """
+        reach = int(math.ceil(range_limit))
+        depths = np.arange(reach + 1)[:, None]
+        columns = np.arange(reach + 2)[None, :]
+        offsets = np.zeros((len(OCTANTS), reach + 1, reach + 2, 2), dtype=np.int64)
+        for i, ((px, py), (sx, sy)) in enumerate(OCTANTS):
+            # Columns past the diagonal are never scanned; clip them to stay inside the window
+            offsets[i, ..., 0] = np.clip(reach + depths * px + columns * sx, 0, 2 * reach)
+            offsets[i, ..., 1] = np.clip(reach + depths * py + columns * sy, 0, 2 * reach)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slopes = (2 * columns - 1) / (2.0 * depths)
+        in_range = depths ** 2 + columns ** 2 <= range_limit ** 2
+        for table in (offsets, slopes, in_range):
+            table.setflags(write=False)
+        return offsets, slopes, in_range
+
+    def __str__(self):
+        return f"FieldOfViewSensor(range_limit={self.range_limit})"
+
+    def __repr__(self):
+        return str(self)
+
+    def __eq__(self, other):
+        return isinstance(other, FieldOfViewSensor) and self.range_limit == other.range_limit
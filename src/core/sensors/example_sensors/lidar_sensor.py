@@ -0,0 +1,177 @@
+import numpy as np
+
+from src.core.sensors.sensor_model import SensorModel
+
+
+class LidarSensor(SensorModel):
+    """
+    2D lidar: `beam_count` beams spread evenly around the agent, each stopping at the first obstacle cell.
+
+    All beams are traced together with a vectorized grid traversal (Amanatides-Woo DDA), one
+    cell crossing per iteration, so a scan costs O(range_limit) array operations on the beams
+    that are still travelling; sense_many() traces the beams of many positions the same way.
+    Grid cells are treated as unit squares centred on their integer coordinates, like the UI
+    draws them.
+
+    Readings:
+        "ranges": (beam_count,) float32 distances to the first obstacle, range_limit where none was hit.
+        "hit_cells": (beam_count, 2) int32 (x, y) obstacle cell hit by each beam, -1 where none was hit.
+        "obstacles_in_range": set of the distinct hit cells, for planners using obstacle lookups.
+    """
+
+    def __init__(self, range_limit=10, beam_count=180, angle_offset=0.0):
+        self.range_limit = range_limit
+        self.beam_count = beam_count
+        self.angle_offset = angle_offset  # Angle of the first beam, in radians
+        self.angles = angle_offset + np.arange(beam_count) * (2 * np.pi / beam_count)
+        self.directions = np.column_stack((np.cos(self.angles), np.sin(self.angles)))
+
+    def sense(self, environment, agent_position):
+        ranges, hit_cells = self.cast(environment, agent_position)
+        hits = hit_cells[hit_cells[:, 0] >= 0]
+        return {"ranges": ranges, "hit_cells": hit_cells, "obstacles_in_range": set(map(tuple, hits.tolist()))}
+
+    def cast(self, environment, agent_position):
+        """Traces every beam from `agent_position` and returns (ranges, hit_cells) as described above."""
+        origins = np.tile(np.asarray(agent_position, dtype=np.float64), (self.beam_count, 1))
+        return self.trace(environment, origins, self.directions)
+
+    def observation(self, environment, agent_position, spacing=0.25):
+        """
+        Marks the cells every beam passed through as observed and the cells the beams hit as occupied.
+
+        Beams are sampled every `spacing` cells up to their range, so the cost grows with
+        beam_count * range_limit / spacing rather than with the map size.
+        """
+        sensor_data = self.reading(environment, agent_position)
+        ranges, hit_cells = sensor_data["ranges"], sensor_data["hit_cells"]
+        hits = hit_cells[hit_cells[:, 0] >= 0]
+
+        steps = np.arange(0.0, self.range_limit, spacing)
+        passed = steps[None, :] < ranges[:, None]  # Samples before each beam's hit
+        distances = np.broadcast_to(steps, passed.shape)[passed]
+        beams = np.nonzero(passed)[0]
+        x = np.floor(agent_position[0] + distances * self.directions[beams, 0] + 0.5).astype(np.int64)
+        y = np.floor(agent_position[1] + distances * self.directions[beams, 1] + 0.5).astype(np.int64)
+        inside = (x >= 0) & (x < environment.width) & (y >= 0) & (y < environment.height)
+        x = np.concatenate((x[inside], hits[:, 0]))
+        y = np.concatenate((y[inside], hits[:, 1]))
+        if len(x) == 0:
+            return np.zeros((0, 0), dtype=bool), np.zeros((0, 0), dtype=bool), 0, 0
+
+        x0, y0 = int(x.min()), int(y.min())
+        observed = np.zeros((int(y.max()) - y0 + 1, int(x.max()) - x0 + 1), dtype=bool)
+        observed[y - y0, x - x0] = True
+        occupied = np.zeros_like(observed)
+        occupied[hits[:, 1] - y0, hits[:, 0] - x0] = True
+        return observed, occupied, x0, y0
+
+    def sense_many(self, environment, positions):
+        """
+        Scans from every position in one traversal of all N * beam_count beams.
+
+        Returns:
+            A dict with "ranges" (N, beam_count) float32 and "hit_cells" (N, beam_count, 2) int32
+            as in sense(), plus the distinct hit cells of every position packed as
+            "obstacle_cells" (M, 2) int32 with "offsets" (N + 1,) int64.
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        count = len(positions)
+        origins = np.repeat(positions, self.beam_count, axis=0)
+        directions = np.tile(self.directions, (count, 1))
+        ranges, hit_cells = self.trace(environment, origins, directions)
+
+        # Distinct hit cells per position, sorted by (position, y, x)
+        owners = np.repeat(np.arange(count), self.beam_count)
+        hits = hit_cells[:, 0] >= 0
+        keys = np.unique((owners[hits].astype(np.int64) * environment.height + hit_cells[hits, 1]) * environment.width
+                         + hit_cells[hits, 0])
+        owner, cell = np.divmod(keys, environment.width * environment.height)
+        obstacle_cells = np.column_stack((cell % environment.width, cell // environment.width)).astype(np.int32)
+        offsets = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(owner, minlength=count), out=offsets[1:])
+
+        return {"ranges": ranges.reshape(count, self.beam_count),
+                "hit_cells": hit_cells.reshape(count, self.beam_count, 2),
+                "obstacle_cells": obstacle_cells, "offsets": offsets}
+
+    def trace(self, environment, origins, directions):
+        """
+        Vectorized DDA over independent beams.
+
+        Args:
+            environment: The Environment object.
+            origins: (B, 2) array of beam start positions.
+            directions: (B, 2) array of unit beam directions.
+
+        Returns:
+            (B,) float32 ranges and (B, 2) int32 hit cells, as in sense().
+        """
+        width, height = environment.width, environment.height
+        occupancy = environment.occupancy
+        count = len(origins)
+        ranges = np.full(count, self.range_limit, dtype=np.float32)
+        hit_cells = np.full((count, 2), -1, dtype=np.int32)
+
+        # Shift so cell (i, j) spans [i, i + 1) x [j, j + 1)
+        origin_x, origin_y = origins[:, 0] + 0.5, origins[:, 1] + 0.5
+        cell_x = np.floor(origin_x).astype(np.int64)
+        cell_y = np.floor(origin_y).astype(np.int64)
+        inside = (cell_x >= 0) & (cell_x < width) & (cell_y >= 0) & (cell_y < height)
+        blocked = np.zeros(count, dtype=bool)
+        blocked[inside] = occupancy[cell_y[inside], cell_x[inside]] != 0
+        # Beams starting inside an obstacle hit it at distance 0
+        ranges[blocked] = 0
+        hit_cells[blocked, 0] = cell_x[blocked]
+        hit_cells[blocked, 1] = cell_y[blocked]
+
+        dx, dy = directions[:, 0], directions[:, 1]
+        step_x = np.where(dx > 0, 1, -1)
+        step_y = np.where(dy > 0, 1, -1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            delta_x = np.abs(1.0 / dx)
+            delta_y = np.abs(1.0 / dy)
+            # Distance along each beam to its first vertical and horizontal cell boundary
+            next_x = np.where(dx > 0, cell_x + 1 - origin_x, origin_x - cell_x) * delta_x
+            next_y = np.where(dy > 0, cell_y + 1 - origin_y, origin_y - cell_y) * delta_y
+        next_x[dx == 0] = np.inf
+        next_y[dy == 0] = np.inf
+
+        beams = np.flatnonzero(inside & ~blocked)
+        cell_x, cell_y = cell_x[beams], cell_y[beams]
+        next_x, next_y = next_x[beams], next_y[beams]
+        while beams.size:
+            # Every travelling beam crosses into its next cell
+            cross_x = next_x < next_y
+            distance = np.where(cross_x, next_x, next_y)
+            cell_x = np.where(cross_x, cell_x + step_x[beams], cell_x)
+            cell_y = np.where(cross_x, cell_y, cell_y + step_y[beams])
+            next_x = np.where(cross_x, next_x + delta_x[beams], next_x)
+            next_y = np.where(cross_x, next_y, next_y + delta_y[beams])
+
+            in_range = distance <= self.range_limit
+            inside = in_range & (cell_x >= 0) & (cell_x < width) & (cell_y >= 0) & (cell_y < height)
+            hit = np.zeros(beams.size, dtype=bool)
+            hit[inside] = occupancy[cell_y[inside], cell_x[inside]] != 0
+
+            hit_beams = beams[hit]
+            ranges[hit_beams] = distance[hit]
+            hit_cells[hit_beams, 0] = cell_x[hit]
+            hit_cells[hit_beams, 1] = cell_y[hit]
+
+            keep = inside & ~hit
+            beams = beams[keep]
+            cell_x, cell_y = cell_x[keep], cell_y[keep]
+            next_x, next_y = next_x[keep], next_y[keep]
+
+        return ranges, hit_cells
+
+    def __str__(self):
+        return f"LidarSensor(range_limit={self.range_limit}, beam_count={self.beam_count})"
+
+    def __repr__(self):
+        return str(self)
+
+    def __eq__(self, other):
+        return isinstance(other, LidarSensor) and (self.range_limit, self.beam_count, self.angle_offset) == \
+            (other.range_limit, other.beam_count, other.angle_offset)
@@ -1,16 +1,57 @@
-from src.core.sensors.sensor_model import SensorModel
+import numpy as np
+
+from src.core.sensors.sensor_model import ObstacleWindow, SensorModel
 
 class RangeSensor(SensorModel):
     def __init__(self, range_limit=5):
         self.range_limit = range_limit  # Add a range_limit attribute
 
     def sense(self, environment, agent_position):
-        detected_obstacles = []
-        for obs_x, obs_y in environment.obstacles:
-            distance = ((agent_position[0] - obs_x)**2 + (agent_position[1] - obs_y)**2)**0.5
-            if distance <= self.range_limit:
-                detected_obstacles.append((obs_x, obs_y))
-        return {"obstacles_in_range": detected_obstacles}
+        # Only the cells within range_limit are read from the occupancy grid
+        mask, x0, y0 = environment.obstacle_window(agent_position, self.range_limit)
+        return {"obstacles_in_range": ObstacleWindow(mask, x0, y0)}
+
+    def observation(self, environment, agent_position):
+        # Every cell in range is seen, free or not
+        observed, x0, y0 = environment.disc_window(agent_position, self.range_limit)
+        window = environment.occupancy[y0:y0 + observed.shape[0], x0:x0 + observed.shape[1]] != 0
+        return observed, observed & window, x0, y0
+
+    def sense_many(self, environment, positions, chunk_size=4096):
+        """
+        Finds the obstacles within range_limit of every position with array operations.
+
+        Each position is checked against the same stencil of cell offsets around its cell, a
+        chunk of positions at a time to bound memory.
+
+        Returns:
+            A dict with "obstacle_cells", an (M, 2) int32 array of the obstacles in range of every
+            position back to back (each position's cells in row-major order), and "offsets", an
+            (N + 1,) int64 array: the cells of position i are obstacle_cells[offsets[i]:offsets[i + 1]].
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        # Every cell within range of a position lies in this window around the position's cell
+        reach = int(np.ceil(self.range_limit)) + 1
+        offset_y, offset_x = np.mgrid[-reach:reach + 1, -reach:reach + 1]
+        offset_x, offset_y = offset_x.ravel(), offset_y.ravel()
+
+        cells, counts = [], []
+        for first in range(0, len(positions), chunk_size):
+            chunk = positions[first:first + chunk_size]
+            x = np.floor(chunk[:, :1]).astype(np.int64) + offset_x
+            y = np.floor(chunk[:, 1:]).astype(np.int64) + offset_y
+            inside = (x >= 0) & (x < environment.width) & (y >= 0) & (y < environment.height)
+            in_range = inside & ((x - chunk[:, :1]) ** 2 + (y - chunk[:, 1:]) ** 2 <= self.range_limit ** 2)
+            found = np.zeros(in_range.shape, dtype=bool)
+            found[in_range] = environment.occupancy[y[in_range], x[in_range]] != 0
+            cells.append(np.column_stack((x[found], y[found])).astype(np.int32))
+            counts.append(found.sum(axis=1))
+
+        offsets = np.zeros(len(positions) + 1, dtype=np.int64)
+        if counts:
+            np.cumsum(np.concatenate(counts), out=offsets[1:])
+        obstacle_cells = np.concatenate(cells) if cells else np.zeros((0, 2), dtype=np.int32)
+        return {"obstacle_cells": obstacle_cells, "offsets": offsets}
 
     def __str__(self):
         return f"RangeSensor(range_limit={self.range_limit})"
@@ -0,0 +1,103 @@
+import numpy as np
+
+from src.core.environment import Environment
+
+
+class OccupancyMap:
+    """
+    Occupancy belief built up from successive sensor readings, stored as float32 log-odds.
+
+    Every cell starts unknown (log-odds 0, probability 0.5). Each reading adds hit_log_odds to
+    the cells it saw occupied and miss_log_odds to the other cells it covered, clamped to
+    [min_log_odds, max_log_odds] so the map can still follow changes. Updates only touch the
+    window of the grid the reading covers, so they cost O(footprint) on any map size.
+
+    Planners can plan on the belief through environment(), an Environment whose obstacles are
+    the cells believed occupied; it is kept in step with every update.
+    """
+
+    def __init__(self, width, height, hit_log_odds=0.85, miss_log_odds=-0.4, min_log_odds=-4.0, max_log_odds=4.0,
+                 occupied_threshold=0.0):
+        self.width = width
+        self.height = height
+        self.hit_log_odds = hit_log_odds  # Added to cells seen occupied
+        self.miss_log_odds = miss_log_odds  # Added to cells seen free
+        self.min_log_odds = min_log_odds
+        self.max_log_odds = max_log_odds
+        self.occupied_threshold = occupied_threshold  # Cells above this log-odds count as obstacles
+        self.log_odds = np.zeros((height, width), dtype=np.float32)
+        self.updates = 0
+        self._environment = None
+
+    def update(self, observed, occupied, x0, y0):
+        """
+        Fuses one observation into the map.
+
+        Args:
+            observed: (h, w) boolean mask of the cells the reading covered.
+            occupied: (h, w) boolean mask of the covered cells seen occupied.
+            x0, y0: Grid cell of the masks' first column and row. Parts outside the map are ignored.
+        """
+        h, w = observed.shape
+        # Crop the masks to the map
+        left, top = max(-x0, 0), max(-y0, 0)
+        right, bottom = min(w, self.width - x0), min(h, self.height - y0)
+        if left >= right or top >= bottom:
+            return
+        observed = observed[top:bottom, left:right]
+        occupied = occupied[top:bottom, left:right]
+        x0, y0 = x0 + left, y0 + top
+
+        window = self.log_odds[y0:y0 + observed.shape[0], x0:x0 + observed.shape[1]]
+        delta = np.where(occupied, np.float32(self.hit_log_odds), np.float32(self.miss_log_odds))
+        window += np.where(observed | occupied, delta, np.float32(0))
+        np.clip(window, self.min_log_odds, self.max_log_odds, out=window)
+        self.updates += 1
+
+        if self._environment is not None:
+            self._sync_environment(window, observed | occupied, x0, y0)
+
+    def integrate(self, sensor, environment: Environment, agent_position):
+        """Senses `environment` from `agent_position` with `sensor` and fuses the reading into the map."""
+        self.update(*sensor.observation(environment, agent_position))
+
+    def probabilities(self):
+        """Returns the occupancy probability of every cell as a (height, width) float32 array."""
+        return (1.0 / (1.0 + np.exp(-self.log_odds))).astype(np.float32)
+
+    def occupied_mask(self):
+        return self.log_odds > self.occupied_threshold
+
+    def known_mask(self):
+        """Cells that have been observed at least once and not drifted back to unknown."""
+        return self.log_odds != 0
+
+    def environment(self) -> Environment:
+        """
+        Returns the belief as an Environment for planning, created on first use.
+
+        Cells never observed keep the occupancy of a fresh Environment (free, apart from its
+        boundary). Later updates rewrite only the cells they observed and notify the
+        environment's change listeners with those cells.
+        """
+        if self._environment is None:
+            environment = Environment(self.width, self.height)
+            known = self.known_mask()
+            environment.occupancy[known] = self.occupied_mask()[known]
+            environment.notify_changed()
+            self._environment = environment
+        return self._environment
+
+    def _sync_environment(self, window, observed, x0, y0):
+        occupancy = self._environment.occupancy[y0:y0 + window.shape[0], x0:x0 + window.shape[1]]
+        belief = (window > self.occupied_threshold).astype(np.uint8)
+        changed = observed & (occupancy != belief)
+        if changed.any():
+            occupancy[changed] = belief[changed]
+            ys, xs = np.nonzero(changed)
+            self._environment.notify_changed(list(zip((xs + x0).tolist(), (ys + y0).tolist())))
+
+    def reset(self):
+        self.log_odds.fill(0)
+        self.updates = 0
+        self._environment = None
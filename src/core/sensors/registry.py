@@ -0,0 +1,143 @@
+import hashlib
+import importlib.metadata
+import importlib.util
+import inspect
+import os
+import sys
+
+from src.core.sensors.sensor_model import SensorModel
+
+# Entry point group installed packages can register SensorModel classes (or modules) under
+ENTRY_POINT_GROUP = "motion_analysis_platform.sensors"
+
+
+def sensor_class_in(module):
+    """
+    Returns the SensorModel subclass a plugin module provides, or None.
+
+    Classes defined in the module itself win over classes it imports, so a plugin that
+    subclasses another sensor is found rather than its base.
+    """
+    candidates = [obj for obj in module.__dict__.values()
+                  if inspect.isclass(obj) and issubclass(obj, SensorModel) and obj is not SensorModel
+                  and not inspect.isabstract(obj)]
+    own = [obj for obj in candidates if obj.__module__ == module.__name__]
+    return (own or candidates or [None])[0]
+
+
+class SensorPlugin:
+    def __init__(self, name, sensor_class, module, path=None, mtime=None):
+        self.name = name  # Display name, the sensor class name
+        self.sensor_class = sensor_class
+        self.module = module
+        self.path = path  # Source file, None for entry points
+        self.mtime = mtime  # Modification time of the source file when it was loaded
+
+    def __repr__(self):
+        return f"SensorPlugin({self.name!r}, path={self.path!r})"
+
+
+class SensorRegistry:
+    """
+    Discovers sensor plugins and keeps their classes loaded.
+
+    Plugins are the .py files of the scanned directories, files added with add_file() and,
+    once per registry, the entry points of ENTRY_POINT_GROUP. Files are keyed by path and
+    modification time: refresh() only stats them and re-executes the ones that changed, each
+    under its own module name. Files that fail to import are remembered too and retried only
+    once they change.
+    """
+
+    def __init__(self, directories=(), entry_point_group=ENTRY_POINT_GROUP):
+        self.directories = list(directories)
+        self.entry_point_group = entry_point_group
+        self._extra_files = []  # Files added with add_file(), in insertion order
+        self._file_plugins = {}  # path -> (mtime, SensorPlugin or None)
+        self._entry_point_plugins = None  # Loaded on first refresh()
+
+    def plugins(self):
+        """Returns the loaded plugins, directory files first (sorted by name), then added files and entry points."""
+        if self._entry_point_plugins is None:
+            self.refresh()
+        loaded = [self._file_plugins.get(path, (None, None))[1] for path in self._paths()]
+        return [plugin for plugin in loaded if plugin is not None] + self._entry_point_plugins
+
+    def refresh(self):
+        """Rescans the directories and reloads the plugin files that were added, changed or removed."""
+        paths = self._paths()
+        for path in set(self._file_plugins) - set(paths):
+            self._forget(path)
+        for path in paths:
+            self._load_file(path)
+        if self._entry_point_plugins is None:
+            self._entry_point_plugins = self._load_entry_points()
+
+    def add_file(self, path):
+        """Registers a plugin file outside the scanned directories and returns its plugin, or None."""
+        path = os.path.abspath(path)
+        if path not in self._extra_files:
+            self._extra_files.append(path)
+        return self._load_file(path)
+
+    def _paths(self):
+        paths = []
+        for directory in self.directories:
+            try:
+                filenames = sorted(os.listdir(directory))
+            except OSError:
+                continue
+            paths.extend(os.path.join(directory, filename) for filename in filenames
+                         if filename.endswith(".py") and not filename.startswith("__"))
+        return paths + [path for path in self._extra_files if path not in paths]
+
+    def _load_file(self, path):
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            self._forget(path)
+            return None
+        cached = self._file_plugins.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        # One module name per file, so plugins never replace each other in sys.modules
+        module_name = "sensor_plugin_" + hashlib.sha1(path.encode()).hexdigest()[:12]
+        plugin = None
+        try:
+            spec = importlib.util.spec_from_file_location(module_name, path)
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[module_name] = module
+            spec.loader.exec_module(module)
+            sensor_class = sensor_class_in(module)
+            if sensor_class is not None:
+                plugin = SensorPlugin(sensor_class.__name__, sensor_class, module, path, mtime)
+        except Exception as e:
+            sys.modules.pop(module_name, None)
+            print(f"Error importing sensor model {path}: {e}")
+        self._file_plugins[path] = (mtime, plugin)
+        return plugin
+
+    def _forget(self, path):
+        cached = self._file_plugins.pop(path, None)
+        if cached is not None and cached[1] is not None:
+            sys.modules.pop(cached[1].module.__name__, None)
+
+    def _load_entry_points(self):
+        plugins = []
+        if not self.entry_point_group:
+            return plugins
+        for entry_point in importlib.metadata.entry_points(group=self.entry_point_group):
+            try:
+                loaded = entry_point.load()
+                sensor_class = sensor_class_in(loaded) if inspect.ismodule(loaded) else loaded
+                if inspect.isclass(sensor_class) and issubclass(sensor_class, SensorModel):
+                    plugins.append(SensorPlugin(entry_point.name, sensor_class, sys.modules[sensor_class.__module__]))
+                else:
+                    print(f"Entry point {entry_point.name} does not provide a SensorModel")
+            except Exception as e:
+                print(f"Error loading sensor entry point {entry_point.name}: {e}")
+        return plugins
+
+
+# Registry of the bundled example sensors, shared by the UI
+sensor_registry_instance = SensorRegistry([os.path.join(os.path.dirname(os.path.abspath(__file__)), "example_sensors")])
@@ -1,6 +1,56 @@
+import weakref
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+import numpy as np
+
+
+class ObstacleWindow:
+    """
+    Sensor reading stored as a boolean window of the grid around the agent.
+
+    Supports `(x, y) in window` in constant time (positions are rounded to their cell, cells
+    outside the window are never obstacles), iteration over the (x, y) obstacle cells and len().
+    """
+
+    def __init__(self, mask, x0, y0):
+        self.mask = mask  # (height, width) boolean array, True where an obstacle was sensed
+        self.x0 = x0  # Grid x of the window's first column
+        self.y0 = y0  # Grid y of the window's first row
+
+    def __contains__(self, position):
+        x = round(position[0]) - self.x0
+        y = round(position[1]) - self.y0
+        return 0 <= y < self.mask.shape[0] and 0 <= x < self.mask.shape[1] and bool(self.mask[y, x])
+
+    def __iter__(self):
+        ys, xs = np.nonzero(self.mask)
+        return zip((xs + self.x0).tolist(), (ys + self.y0).tolist())
+
+    def __len__(self):
+        return int(np.count_nonzero(self.mask))
+
+
+def obstacle_lookup(sensor_data):
+    """
+    Returns the obstacles of a sensor reading as a container with constant-time membership.
+
+    `sensor_data["obstacles_in_range"]` may be a set of (x, y) cells or an ObstacleWindow,
+    which are returned as they are, or any other iterable of (x, y) positions, which is turned
+    into a set of rounded cells once. Look positions up as (round(x), round(y)).
+    """
+    obstacles = sensor_data.get("obstacles_in_range", ()) if sensor_data else ()
+    if isinstance(obstacles, (set, frozenset, ObstacleWindow)):
+        return obstacles
+    return {(round(x), round(y)) for x, y in obstacles}
+
 
 class SensorModel(ABC):
+    # Per-position reading cache, off until enable_cache() is called
+    _reading_cache = None  # OrderedDict of (x, y) -> reading, least recently used first
+    _reading_cache_size = 0
+    _reading_cache_stamp = None  # (weakref to the Environment, its version) the cached readings belong to
+
     @abstractmethod
     def sense(self, environment, agent_position):
         """
@@ -11,6 +61,105 @@ class SensorModel(ABC):
             agent_position: The current position of the agent (x, y).
 
         Returns:
-            Sensor data (can be a dictionary, tuple, etc.).
+            Sensor data (can be a dictionary, tuple, etc.). Obstacle sensors report the sensed
+            cells under "obstacles_in_range", as a list, a set of (x, y) cells or an ObstacleWindow.
         """
-        pass
\ No newline at end of file
+        pass
+
+    def sense_many(self, environment, positions):
+        """
+        Senses from many positions at once.
+
+        This generic version calls reading() per position; sensors that can should override it
+        with array operations, keeping the packed keys below and adding their own.
+
+        Args:
+            environment: The Environment object.
+            positions: Array-like of shape (N, 2) with (x, y) positions.
+
+        Returns:
+            A dict with the sensed obstacle cells of every position packed into "obstacle_cells",
+            an (M, 2) int32 array, with "offsets", an (N + 1,) int64 array: the cells of
+            position i are obstacle_cells[offsets[i]:offsets[i + 1]]. The generic version also
+            returns the per-position readings as "readings".
+        """
+        readings = [self.reading(environment, position) for position in np.asarray(positions).reshape(-1, 2).tolist()]
+        cells = [sorted(obstacle_lookup(sensor_data), key=lambda cell: (cell[1], cell[0])) for sensor_data in readings]
+        offsets = np.zeros(len(readings) + 1, dtype=np.int64)
+        np.cumsum([len(position_cells) for position_cells in cells], out=offsets[1:])
+        obstacle_cells = np.array([cell for position_cells in cells for cell in position_cells],
+                                  dtype=np.int32).reshape(-1, 2)
+        return {"obstacle_cells": obstacle_cells, "offsets": offsets, "readings": readings}
+
+    def observation(self, environment, agent_position):
+        """
+        Describes what one reading saw, as windows of the grid for occupancy mapping.
+
+        This generic version only knows the sensed obstacle cells, so it observes nothing but
+        them; sensors that also see free space (everything in range, or along their beams)
+        should override it.
+
+        Returns:
+            (observed, occupied, x0, y0): boolean (height, width) masks of the cells the reading
+            covers and of the obstacles among them, and the grid cell of their first column and row.
+        """
+        obstacles = obstacle_lookup(self.reading(environment, agent_position))
+        if isinstance(obstacles, ObstacleWindow):
+            return obstacles.mask, obstacles.mask, obstacles.x0, obstacles.y0
+
+        cells = np.array(list(obstacles), dtype=np.int64).reshape(-1, 2)
+        inside = (cells[:, 0] >= 0) & (cells[:, 0] < environment.width) & \
+                 (cells[:, 1] >= 0) & (cells[:, 1] < environment.height)
+        cells = cells[inside]
+        if len(cells) == 0:
+            return np.zeros((0, 0), dtype=bool), np.zeros((0, 0), dtype=bool), 0, 0
+        x0, y0 = cells.min(axis=0)
+        x1, y1 = cells.max(axis=0)
+        occupied = np.zeros((y1 - y0 + 1, x1 - x0 + 1), dtype=bool)
+        occupied[cells[:, 1] - y0, cells[:, 0] - x0] = True
+        return occupied, occupied, int(x0), int(y0)
+
+    def enable_cache(self, max_entries=1024):
+        """
+        Makes reading() remember up to `max_entries` readings by position, least recently used
+        evicted first. All cached readings are dropped when the environment changes (its version
+        moves on) or a different environment is sensed.
+        """
+        self._reading_cache = OrderedDict()
+        self._reading_cache_size = max_entries
+        self._reading_cache_stamp = None
+
+    def disable_cache(self):
+        self._reading_cache = None
+        self._reading_cache_stamp = None
+
+    def reading(self, environment, agent_position):
+        """
+        Returns sense(environment, agent_position), served from the reading cache when it is enabled.
+
+        Cached readings are shared between callers and must not be modified.
+        """
+        cache = self._reading_cache
+        if cache is None:
+            return self.sense(environment, agent_position)
+
+        stamp = self._reading_cache_stamp
+        if stamp is None or stamp[0]() is not environment or stamp[1] != environment.version:
+            cache.clear()
+            self._reading_cache_stamp = (weakref.ref(environment), environment.version)
+
+        key = (agent_position[0], agent_position[1])
+        sensor_data = cache.get(key)
+        if sensor_data is not None:
+            cache.move_to_end(key)
+            return sensor_data
+
+        sensor_data = self.sense(environment, agent_position)
+        cache[key] = sensor_data
+        if len(cache) > self._reading_cache_size:
+            cache.popitem(last=False)
+        return sensor_data
+
+    def sense_obstacles(self, environment, agent_position):
+        """Senses once and returns the sensed obstacle cells with constant-time `(x, y) in ...` lookups."""
+        return obstacle_lookup(self.reading(environment, agent_position))
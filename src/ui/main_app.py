@@ -143,16 +143,17 @@ class MAPApp:
     def load_algorithm(self, algorithm_name):
         self.selected_algorithm_name = algorithm_name
 
-    def load_sensor(self, sensor_module):
-        self.imported_sensor_module = sensor_module
-        # Try to instantiate the first class that inherits from SensorModel
-        for name, obj in sensor_module.__dict__.items():
-            if inspect.isclass(obj) and issubclass(obj, sensors.SensorModel) and obj != sensors.SensorModel:
-                self.selected_sensor = obj()
-                print(f"Loaded sensor: {self.selected_sensor}")
-                return
-        print("No valid SensorModel found in the imported module.")
-        self.selected_sensor = None
+    def load_sensor(self, sensor):
+        """Instantiates a SensorModel subclass, or the one a plugin module provides, as the selected sensor."""
+        sensor_class = sensors.sensor_class_in(sensor) if inspect.ismodule(sensor) else sensor
+        if sensor_class is None:
+            print("No valid SensorModel found in the imported module.")
+            self.selected_sensor = None
+            return
+        self.imported_sensor_module = inspect.getmodule(sensor_class)
+        self.selected_sensor = sensor_class()
+        self.selected_sensor.enable_cache(CONFIG.sensor_cache_size)
+        print(f"Loaded sensor: {self.selected_sensor}")
 
     def run_selected_algorithm(self):
         self.current_screen = "execution"
@@ -54,10 +54,15 @@ class AlgorithmSelectionScreen:
         # Algorithm Buttons
         available_algorithms = AlgorithmSelectionScreen.get_available_algorithms()
         app.algorithm_selection_screen.algorithm_buttons = []
+        # Wrap into extra columns once the buttons no longer fit above the instructions
+        buttons_per_column = max(1, (app.screen_height - button_y_start - 60) // (button_height + button_spacing))
+        columns = -(-len(available_algorithms) // buttons_per_column)
+        columns_width = columns * (button_width + button_spacing) - button_spacing
         for i, algo_name in enumerate(available_algorithms):
+            column, row = divmod(i, buttons_per_column)
             button_rect = Button(
-                app.screen_width // 2 - button_width // 2,
-                button_y_start + i * (button_height + button_spacing),
+                app.screen_width // 2 - columns_width // 2 + column * (button_width + button_spacing),
+                button_y_start + row * (button_height + button_spacing),
                 button_width,
                 button_height,
                 algo_name.replace("_", " ").title(),
@@ -4,6 +4,7 @@ import time
 import tkinter as tk
 from tkinter import filedialog
 
+import numpy as np
 import pygame
 
 from src.config import config_instance as CONFIG
@@ -46,8 +47,7 @@ class EnvironmentEditorScreen:
             if app.environment_editor_screen.drawing_obstacle:
                 app.environment.add_obstacle(grid_x, grid_y)
             elif app.environment_editor_screen.erasing_obstacle:
-                if (grid_x, grid_y) in app.environment.obstacles:
-                    app.environment.obstacles.remove((grid_x, grid_y))
+                app.environment.remove_obstacle(grid_x, grid_y)
         elif event.type == pygame.MOUSEMOTION:
             mouse_pos = pygame.mouse.get_pos()
             grid_x = mouse_pos[0] // EnvironmentEditorScreen.get_cell_size()
@@ -56,8 +56,7 @@ class EnvironmentEditorScreen:
                 if app.environment_editor_screen.drawing_obstacle:
                     app.environment.add_obstacle(grid_x, grid_y)
                 elif app.environment_editor_screen.erasing_obstacle:
-                    if (grid_x, grid_y) in app.environment.obstacles:
-                        app.environment.obstacles.remove((grid_x, grid_y))
+                    app.environment.remove_obstacle(grid_x, grid_y)
 
 
     @staticmethod
@@ -137,7 +136,8 @@ class EnvironmentEditorScreen:
                         "height": app.environment.height,
                         "obstacles": list(app.environment.obstacles),
                         "start": app.environment.start,
-                        "goal": app.environment.goal
+                        "goal": app.environment.goal,
+                        "costs": app.environment.costs.tolist() if app.environment.costs is not None else None
                     }, f, indent=4)
                 print(f"Environment saved to {file_path}")
             except Exception as e:
@@ -153,8 +153,9 @@ class EnvironmentEditorScreen:
             try:
                 with open(file_path, 'r') as f:
                     data = json.load(f)
-                    app.environment.width = data.get("width", app.environment.width)
-                    app.environment.height = data.get("height", app.environment.height)
+                    app.environment.resize(data.get("width", app.environment.width),
+                                           data.get("height", app.environment.height))
+                    app.environment.costs = np.array(data["costs"], dtype=np.float32) if data.get("costs") else None
                     app.environment.obstacles = set(tuple(obs) for obs in data.get("obstacles", []))
                     app.environment.start = tuple(data.get("start")) if data.get("start") else None
                     app.environment.goal = tuple(data.get("goal")) if data.get("goal") else None
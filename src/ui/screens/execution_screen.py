@@ -1,5 +1,6 @@
 import time
 
+import numpy as np
 import pygame
 
 from src.config import config_instance as CONFIG
@@ -25,7 +26,11 @@ class ExecutionScreen:
         self.last_update_time = 0
         self.explored_cells = []
         self.nodes = []  # Initialize nodes here
-        self.grid_data = []  # Initialize grid data here
+        self.grid_data = None  # Brushfire distances, a (height, width) int32 array updated in place
+        self.grid_labels = {}  # Rendered grid values, reused across frames
+        self.start_tree_cells = set()  # Cells explored from the start by bidirectional planners
+        self.goal_tree_cells = set()  # Cells explored from the goal by bidirectional planners
+        self.heatmap = None  # Potential field heatmap surface, if the planner precomputes its field
 
     def reset(self):
         self.start_pos = None
@@ -33,7 +38,10 @@ class ExecutionScreen:
         self.path = None
         self.algorithm_generator = None
         self.explored_cells = []
-        self.grid_data = []
+        self.grid_data = None
+        self.start_tree_cells = set()
+        self.goal_tree_cells = set()
+        self.heatmap = None
 
 
     @staticmethod
@@ -66,9 +74,9 @@ class ExecutionScreen:
             if current_time - app.execution_screen.last_update_time > app.execution_screen.animation_speed:
                 if app.selected_algorithm_name.startswith("Brushfire"):
                     try:
-                        path, app.execution_screen.step, grid_data = next(app.execution_screen.algorithm_generator)
+                        path, app.execution_screen.step, changed = next(app.execution_screen.algorithm_generator)
 
-                        app.execution_screen.grid_data = grid_data
+                        ExecutionScreen.apply_grid_changes(app, changed)
                         app.execution_screen.path = path
                         app.execution_screen.explored_cells.extend(app.execution_screen.path)
                         # Remove duplicates
@@ -78,6 +86,19 @@ class ExecutionScreen:
                     except StopIteration:
                         app.execution_screen.algorithm_generator = None  # Algorithm finished
 
+                elif app.selected_algorithm_name.startswith("Bidirectional"):
+                    try:
+                        path, app.execution_screen.step, (start_tree, goal_tree) = next(
+                            app.execution_screen.algorithm_generator)
+
+                        app.execution_screen.path = path
+                        app.execution_screen.start_tree_cells.update(start_tree)
+                        app.execution_screen.goal_tree_cells.update(goal_tree)
+                        app.execution_screen.last_update_time = current_time
+
+                    except StopIteration:
+                        app.execution_screen.algorithm_generator = None  # Algorithm finished
+
                 else:
                     try:
                         result, app.execution_screen.step = next(app.execution_screen.algorithm_generator)
@@ -102,6 +123,10 @@ class ExecutionScreen:
         for y in range(0, app.screen_height, cell_size):
             pygame.draw.line(app.screen, CONFIG.grid_color, (0, y), (app.screen_width, y))
 
+        # Draw Potential Field Heatmap
+        if app.execution_screen.heatmap is not None:
+            app.screen.blit(app.execution_screen.heatmap, (0, 0))
+
         # Draw Obstacles
         for obs_x, obs_y in app.environment.obstacles:
             rect = pygame.Rect(obs_x * cell_size, obs_y * cell_size, cell_size, cell_size)
@@ -112,6 +137,12 @@ class ExecutionScreen:
             rect = pygame.Rect(explored_x * cell_size, explored_y * cell_size, cell_size, cell_size)
             pygame.draw.rect(app.screen, CONFIG.explored_color, rect)
 
+        # Draw Bidirectional Search Trees
+        for tree_cells, tree_color in ((app.execution_screen.start_tree_cells, CONFIG.start_tree_color),
+                                       (app.execution_screen.goal_tree_cells, CONFIG.goal_tree_color)):
+            for tree_x, tree_y in tree_cells:
+                rect = pygame.Rect(tree_x * cell_size, tree_y * cell_size, cell_size, cell_size)
+                pygame.draw.rect(app.screen, tree_color, rect)
 
         # Draw Start and Goal
         if app.execution_screen.start_pos:
@@ -130,19 +161,25 @@ class ExecutionScreen:
             if len(points) > 1:
                 pygame.draw.lines(app.screen, CONFIG.path_color, False, points, 3)
         # Draw Grid Values
-        if app.execution_screen.grid_data:
-            font = pygame.font.Font(None, 24)
-            for y, row in enumerate(app.execution_screen.grid_data):
-                for x, value in enumerate(row):
-                    text = font.render(str(value), True, (0, 0, 0))
-                    app.screen.blit(text, (x * cell_size + 5, y * cell_size + 5))
+        if app.execution_screen.grid_data is not None:
+            labels = app.execution_screen.grid_labels
+            font = None
+            reached_y, reached_x = (app.execution_screen.grid_data >= 0).nonzero()
+            for x, y, value in zip(reached_x.tolist(), reached_y.tolist(),
+                                   app.execution_screen.grid_data[reached_y, reached_x].tolist()):
+                if value not in labels:
+                    font = font or pygame.font.Font(None, 24)
+                    labels[value] = font.render(str(value), True, (0, 0, 0))
+                app.screen.blit(labels[value], (x * cell_size + 5, y * cell_size + 5))
 
         # Draw Step Counter
         font = pygame.font.Font(None, 24)
         text = font.render(f"Step: {app.execution_screen.step}", True, (0, 0, 0))
         app.screen.blit(text, (10, CONFIG.screen_height))
         # Draw Explore Counter
-        text = font.render(f"Explored Cells: {len(app.execution_screen.explored_cells)}", True, (0, 0, 0))
+        explored_count = len(app.execution_screen.explored_cells) + len(app.execution_screen.start_tree_cells) + \
+            len(app.execution_screen.goal_tree_cells)
+        text = font.render(f"Explored Cells: {explored_count}", True, (0, 0, 0))
         app.screen.blit(text, (100, CONFIG.screen_height))
 
 
@@ -181,7 +218,7 @@ class ExecutionScreen:
             sensor_range = app.selected_sensor.range_limit  # Assuming a 'range_limit' attribute
             ExecutionScreen.draw_sensor_range(app.screen, current_position, sensor_range,
                                               app.execution_screen.cell_size)
-            ExecutionScreen.draw_sensor_output(app.screen, app.selected_sensor.sense(app.environment, current_position),
+            ExecutionScreen.draw_sensor_output(app.screen, app.selected_sensor.reading(app.environment, current_position),
                                                app.execution_screen.cell_size)
 
 
@@ -219,7 +256,9 @@ class ExecutionScreen:
     @staticmethod
     def draw_sensor_output(screen, sensor_output, cell_size):
         for sensor_name, sensor_data in sensor_output.items():
-            if sensor_name == "obstacles_in_range":
+            if sensor_name == "visible_cells":
+                ExecutionScreen.draw_visible_cells(screen, sensor_data, cell_size)
+            elif sensor_name == "obstacles_in_range":
                 for obstacle_pos in sensor_data:
                     rect = pygame.Rect(obstacle_pos[0] * cell_size, obstacle_pos[1] * cell_size, cell_size, cell_size)
                     pygame.draw.rect(screen, CONFIG.collision_color, rect)
@@ -233,6 +272,46 @@ class ExecutionScreen:
 
 
 
+    @staticmethod
+    def apply_grid_changes(app, changed):
+        """Writes a Brushfire frame's (x, y, distance) changes into the persistent distance array."""
+        if app.execution_screen.grid_data is None or \
+                app.execution_screen.grid_data.shape != (app.environment.height, app.environment.width):
+            app.execution_screen.grid_data = np.full((app.environment.height, app.environment.width), -1,
+                                                     dtype=np.int32)
+        if len(changed):
+            changed = np.asarray(changed, dtype=np.int64).reshape(-1, 3)
+            app.execution_screen.grid_data[changed[:, 1], changed[:, 0]] = changed[:, 2]
+
+    @staticmethod
+    def draw_visible_cells(screen, window, cell_size):
+        """Shades the cells of an ObstacleWindow of visible cells with the sensor range color."""
+        if window.mask.size == 0:
+            return
+        colors = np.zeros(window.mask.shape + (3,), dtype=np.uint8)
+        colors[window.mask] = CONFIG.sensor_range_color[:3]
+        surface = pygame.surfarray.make_surface(colors.transpose(1, 0, 2))  # Surfaces are indexed [x, y]
+        surface = pygame.transform.scale(surface, (window.mask.shape[1] * cell_size, window.mask.shape[0] * cell_size))
+        surface.set_colorkey((0, 0, 0))  # Hidden cells stay transparent
+        surface.set_alpha(CONFIG.sensor_range_color[3])
+        screen.blit(surface, (window.x0 * cell_size, window.y0 * cell_size))
+
+    @staticmethod
+    def build_heatmap(potential, cell_size):
+        """Renders a (height, width) potential array as a translucent blue-to-red surface, one cell per grid cell."""
+        # Log scale, capped so the spikes next to obstacles do not wash out the rest of the field
+        values = np.log1p(np.maximum(potential, 0))
+        cap = np.percentile(values, 99) if values.size else 0
+        values = np.clip(values / cap, 0, 1) if cap > 0 else np.zeros_like(values)
+        colors = np.zeros(values.shape + (3,), dtype=np.uint8)
+        colors[..., 0] = (255 * values).astype(np.uint8)
+        colors[..., 2] = (255 * (1 - values)).astype(np.uint8)
+
+        surface = pygame.surfarray.make_surface(colors.transpose(1, 0, 2))  # Surfaces are indexed [x, y]
+        surface = pygame.transform.scale(surface, (potential.shape[1] * cell_size, potential.shape[0] * cell_size))
+        surface.set_alpha(CONFIG.heatmap_alpha)
+        return surface
+
     @staticmethod
     def get_cell_size():
         return CONFIG.grid_resolution
@@ -248,6 +327,14 @@ class ExecutionScreen:
                 planner = selected_algorithm_class(app.selected_sensor)
             else:
                 planner = selected_algorithm_class()
+            planner.set_trace(CONFIG.trace_level, CONFIG.trace_interval)
 
             app.execution_screen.algorithm_generator = planner.plan(app.environment)
+            app.execution_screen.heatmap = None
+            if CONFIG.show_potential_heatmap and hasattr(planner, "potential_grid"):
+                app.execution_screen.heatmap = ExecutionScreen.build_heatmap(
+                    planner.potential_grid(app.environment).potential, ExecutionScreen.get_cell_size())
             app.execution_screen.explored_cells = []
+            app.execution_screen.grid_data = None
+            app.execution_screen.start_tree_cells = set()
+            app.execution_screen.goal_tree_cells = set()
@@ -1,15 +1,11 @@
-import importlib
-import importlib.util
-import inspect
-import os
-import sys
+import time
 import tkinter as tk
 from tkinter import filedialog
 
 import pygame
 
 from src.config import config_instance as CONFIG
-from src.core.sensors.sensor_model import SensorModel
+from src.core.sensors.registry import sensor_registry_instance
 from src.ui.assets import Button
 
 
@@ -17,8 +13,10 @@ class SensorImportScreen:
     def __init__(self):
         self.import_button_rect = None
         self.imported_sensor_name = None
-        self.available_sensors = []  # List to store available sensor names
+        self.available_sensors = []  # Sensor plugins listed on the screen
         self.sensor_buttons = []  # List to store sensor selection buttons
+        self.registry = sensor_registry_instance
+        self.last_refresh = None  # time.monotonic() of the last registry rescan
 
     @staticmethod
     def handle_input(app, event):
@@ -55,10 +53,10 @@ class SensorImportScreen:
         title_rect = title_text.get_rect(center=(app.screen_width // 2, 100))
         app.screen.blit(title_text, title_rect)
 
-        available_sensors = SensorImportScreen.load_sensor_modules()
+        available_sensors = SensorImportScreen.load_sensor_modules(app)
         app.sensor_import_screen.sensor_buttons = []
-        for i, path in enumerate(available_sensors):
-            module_name, module = SensorImportScreen.get_sensor_info_from_file(path)
+        for i, plugin in enumerate(available_sensors):
+            module_name = plugin.name
 
             button_rect = Button(
                 app.screen_width // 2 - button_width // 2,
@@ -66,7 +64,7 @@ class SensorImportScreen:
                 button_width,
                 button_height,
                 module_name.replace("_", " ").title(),
-                action=lambda: app.load_sensor(module)
+                action=lambda sensor_class=plugin.sensor_class: app.load_sensor(sensor_class)
             )
 
             app.sensor_import_screen.sensor_buttons.append((module_name, button_rect))
@@ -127,43 +125,24 @@ class SensorImportScreen:
 
     @staticmethod
     def load_sensor_from_file(app, file_path):
-        try:
-            spec = importlib.util.spec_from_file_location("custom_sensor_module", file_path)
-            module = importlib.util.module_from_spec(spec)
-            sys.modules["custom_sensor_module"] = module
-            spec.loader.exec_module(module)
-            # print([name for name, obj in inspect.getmembers(module)])
-            app.load_sensor(module)  # Load the sensor in MAPApp
-        except Exception as e:
-            print(f"Error importing sensor model: {e}")
+        plugin = app.sensor_import_screen.registry.add_file(file_path)
+        if plugin is not None:
+            app.load_sensor(plugin.sensor_class)  # Load the sensor in MAPApp
+        else:
+            print(f"No valid SensorModel found in {file_path}")
 
     @staticmethod
-    def get_sensor_info_from_file(file_path):
-        try:
-            spec = importlib.util.spec_from_file_location("custom_sensor_module", file_path)
-            module = importlib.util.module_from_spec(spec)
-            sys.modules["custom_sensor_module"] = module
-            spec.loader.exec_module(module)
-            for name, obj in inspect.getmembers(module):
-                if inspect.isclass(obj) and issubclass(obj, SensorModel) and obj != SensorModel:
-                    return (obj.__name__, module)
-        except Exception as e:
-            print(f"Error importing sensor model: {e}")
-        return None
-
-    @staticmethod
-    def load_sensor_modules():
-        """Loads available sensor modules from the sensors directory."""
-        available_sensors = []
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        src_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))
-        sensors_dir = os.path.join(src_dir, "src","core", "sensors", "example_sensors")
-
-        for filename in os.listdir(sensors_dir):
-            if filename.endswith(
-                    ".py") and filename != "__init__.py" and filename != "sensor_model.py" and filename.startswith(
-                "__") == False:
-                module_name = filename[:-3]
-                path = os.path.join(sensors_dir, filename)
-                available_sensors.append(path)
-        return available_sensors
+    def load_sensor_modules(app):
+        """
+        Returns the available sensor plugins.
+
+        The registry is rescanned at most every CONFIG.sensor_rescan_interval seconds, and a
+        rescan only re-imports the plugin files that changed since they were loaded.
+        """
+        screen = app.sensor_import_screen
+        now = time.monotonic()
+        if screen.last_refresh is None or now - screen.last_refresh >= CONFIG.sensor_rescan_interval:
+            screen.registry.refresh()
+            screen.available_sensors = screen.registry.plugins()
+            screen.last_refresh = now
+        return screen.available_sensors
@@ -0,0 +1,153 @@
+from array import array
+
+import numpy as np
+
+
+def to_index(position, width):
+    """Converts an (x, y) cell to its flat row-major index."""
+    return int(position[1]) * width + int(position[0])
+
+
+def to_position(index, width):
+    """Converts a flat row-major index back to an (x, y) cell."""
+    y, x = divmod(index, width)
+    return x, y
+
+
+def manhattan(a, b):
+    """Manhattan distance between two (x, y) cells, the exact hop count on an empty 4-connected grid."""
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+def new_parents(size):
+    """Returns an int32 parent array of the given size with every entry set to -1."""
+    return array('i', [-1]) * size
+
+
+def reconstruct_path(parents, index, width):
+    """
+    Follows parent pointers back from `index` to the root of the search tree.
+
+    Args:
+        parents: Sequence mapping a flat cell index to its parent index (-1 for the root).
+        index: Flat index of the last cell of the path.
+        width: Width of the grid the indices refer to.
+
+    Returns:
+        A list of (x, y) tuples from the root to `index`.
+    """
+    path = []
+    while index != -1:
+        path.append(to_position(index, width))
+        index = parents[index]
+    path.reverse()
+    return path
+
+
+# Frontiers up to this size are expanded cell by cell in wavefront()
+SMALL_FRONTIER = 64
+
+
+def neighbor_indices(frontier, width, height):
+    """
+    Returns the 4-connected neighbours of every flat index in `frontier` as one array.
+
+    Cells on the grid border only get the neighbours that lie inside the grid.
+    """
+    x = frontier % width
+    return np.concatenate((
+        frontier[frontier < (height - 1) * width] + width,
+        frontier[frontier >= width] - width,
+        frontier[x < width - 1] + 1,
+        frontier[x > 0] - 1,
+    ))
+
+
+def wavefront(free, sources, target=None):
+    """
+    Level-synchronous breadth-first search over a boolean grid.
+
+    The whole frontier is expanded per iteration with array operations on flat indices,
+    so the cost per level is proportional to the frontier size rather than to the grid.
+
+    Args:
+        free: (height, width) boolean array, True where a cell can be entered.
+        sources: Iterable of flat indices that start at distance 0.
+        target: Optional flat index; the search stops once its level has been reached.
+
+    Returns:
+        A (height, width) int32 array of hop distances, -1 where a cell was not reached.
+    """
+    distances = np.full(free.size, -1, dtype=np.int32)
+    for _ in wavefront_levels(free, sources, distances, target):
+        pass
+    return distances.reshape(free.shape)
+
+
+def wavefront_levels(free, sources, distances, target=None):
+    """
+    Generator form of wavefront() for consumers that want to watch the wave grow.
+
+    Fills the flat int32 array `distances` (all -1 on entry) in place and yields
+    (level, frontier) for every layer, the sources being layer 0. `frontier` holds the flat
+    indices reached at that level.
+    """
+    height, width = free.shape
+    free = free.ravel()
+    free_bytes = free.tobytes()
+    distance_view = memoryview(distances)
+    frontier = np.unique(np.asarray(list(sources), dtype=np.intp))
+    distances[frontier] = 0
+    # Scratch array used to drop duplicate candidates without sorting
+    slots = np.empty(free.size, dtype=np.int32)
+    level = 0
+    if frontier.size:
+        yield level, frontier
+
+    while frontier.size and (target is None or distances[target] < 0):
+        level += 1
+        if frontier.size <= SMALL_FRONTIER:
+            # Array calls cost more than they save on tiny frontiers (e.g. long corridors)
+            next_frontier = []
+            for current in frontier.tolist():
+                y, x = divmod(current, width)
+                for neighbor, inside in ((current + width, y + 1 < height), (current - width, y > 0),
+                                         (current + 1, x + 1 < width), (current - 1, x > 0)):
+                    if inside and free_bytes[neighbor] and distance_view[neighbor] < 0:
+                        distance_view[neighbor] = level
+                        next_frontier.append(neighbor)
+            frontier = np.array(next_frontier, dtype=np.intp)
+        else:
+            candidates = neighbor_indices(frontier, width, height)
+            candidates = candidates[free[candidates] & (distances[candidates] < 0)]
+            order = np.arange(candidates.size, dtype=np.int32)
+            slots[candidates] = order
+            frontier = candidates[slots[candidates] == order]
+            distances[frontier] = level
+        if frontier.size:
+            yield level, frontier
+
+
+def descend(distances, index, width, height):
+    """
+    Follows a distance field downhill from `index` until a cell at distance 0 is reached.
+
+    Returns:
+        A list of (x, y) tuples, or None if `index` was not reached by the field.
+    """
+    field = distances.ravel()
+    if field[index] < 0:
+        return None
+    path = [to_position(index, width)]
+    while field[index] > 0:
+        y, x = divmod(index, width)
+        for neighbor_x, neighbor_y in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)):
+            if 0 <= neighbor_x < width and 0 <= neighbor_y < height:
+                neighbor = neighbor_y * width + neighbor_x
+                if 0 <= field[neighbor] < field[index]:
+                    index = neighbor
+                    break
+        else:
+            return path  # No downhill neighbour left
+        path.append((neighbor_x, neighbor_y))
+    return path
@@ -0,0 +1,258 @@
+import unittest
+
+import numpy as np
+
+from src.core.algorithms.hierarchical import AbstractGraph, HierarchicalPlanner
+from src.core.algorithms.incremental import DStarLitePlanner
+from src.core.algorithms.jump_point_search import JumpPointSearchPlanner
+from src.core.algorithms.search_algorithms import AStarPlanner, BreadthFirstSearchPlanner, DepthFirstSearchPlanner, \
+    DijkstraPlanner
+from src.core.environment import Environment
+from src.core.sensors.example_sensors.lidar_sensor import LidarSensor
+from src.core.sensors.example_sensors.range_sensor import RangeSensor
+from src.core.sensors.sensor_model import SensorModel
+from src.core.motion_planner import TRACE_FULL, TRACE_NONE, TRACE_SAMPLED
+from src.utils.grid import to_index, wavefront
+
+
+def random_environment(rng, width, height, density):
+    environment = Environment(width, height)
+    environment.occupancy[rng.random((height, width)) < density] = 1
+    environment.notify_changed()
+    return environment
+
+
+def random_free_cell(rng, environment):
+    free = np.argwhere(environment.occupancy == 0)
+    y, x = free[rng.integers(len(free))]
+    return int(x), int(y)
+
+
+def hop_distance(environment, start, goal):
+    """Reference shortest path length from a whole-grid BFS, None if the goal is unreachable."""
+    distances = wavefront(environment.occupancy == 0, [to_index(start, environment.width)])
+    distance = int(distances[goal[1], goal[0]])
+    return distance if distance >= 0 else None
+
+
+def drain(generator):
+    """Runs a plan() generator to the end and returns its yields and its return value."""
+    yields = []
+    try:
+        while True:
+            yields.append(next(generator))
+    except StopIteration as stop:
+        return yields, stop.value
+
+
+class PlannerTestCase(unittest.TestCase):
+    def assert_valid_path(self, environment, path, start, goal):
+        self.assertIsNotNone(path, f"No path found from {start} to {goal}")
+        self.assertEqual(tuple(path[0]), tuple(start))
+        self.assertEqual(tuple(path[-1]), tuple(goal))
+        for (x0, y0), (x1, y1) in zip(path, path[1:]):
+            self.assertEqual(abs(x1 - x0) + abs(y1 - y0), 1, f"Path jumps from {(x0, y0)} to {(x1, y1)}")
+            self.assertFalse(environment.occupancy[y1, x1], f"Path crosses the obstacle at {(x1, y1)}")
+
+
+class SearchPlannerTests(PlannerTestCase):
+    """plan() and find_path() of the planners on the shared SearchPlanner driver, against a BFS reference."""
+
+    OPTIMAL = (BreadthFirstSearchPlanner, DijkstraPlanner, AStarPlanner, JumpPointSearchPlanner)
+    PLANNERS = OPTIMAL + (DepthFirstSearchPlanner, HierarchicalPlanner)
+
+    @staticmethod
+    def make_planner(planner_class):
+        return planner_class(cluster_size=6) if planner_class is HierarchicalPlanner else planner_class()
+
+    def test_paths_match_reference_at_every_trace_level(self):
+        rng = np.random.default_rng(11)
+        for trial in range(12):
+            environment = random_environment(rng, 26, 22, 0.3)
+            start, goal = random_free_cell(rng, environment), random_free_cell(rng, environment)
+            environment.set_start(*start)
+            environment.set_goal(*goal)
+            distance = hop_distance(environment, start, goal)
+
+            for planner_class in self.PLANNERS:
+                with self.subTest(trial=trial, planner=planner_class.__name__):
+                    path, _ = self.make_planner(planner_class).find_path(environment)
+                    if distance is None:
+                        self.assertIsNone(path)
+                        continue
+                    self.assert_valid_path(environment, path, start, goal)
+                    if planner_class in self.OPTIMAL:
+                        self.assertEqual(len(path) - 1, distance)
+
+                    for level in (TRACE_FULL, TRACE_SAMPLED, TRACE_NONE):
+                        planner = self.make_planner(planner_class).set_trace(level, 3)
+                        yields, result = drain(planner.plan(environment))
+                        self.assertEqual(result[0], path)
+                        self.assertEqual(yields[-1][0], path)
+                        if level == TRACE_NONE:
+                            self.assertEqual(len(yields), 1)
+
+    def test_unreachable_goal(self):
+        environment = Environment(12, 12)
+        for y in range(12):
+            environment.add_obstacle(6, y)
+        environment.set_start(2, 2)
+        environment.set_goal(9, 2)
+        for planner_class in self.PLANNERS:
+            with self.subTest(planner=planner_class.__name__):
+                self.assertIsNone(self.make_planner(planner_class).find_path(environment)[0])
+                yields, result = drain(self.make_planner(planner_class).set_trace(TRACE_NONE).plan(environment))
+                self.assertEqual(yields, [])
+                self.assertIsNone(result[0])
+
+
+def random_edits(rng, environment, count, keep=()):
+    """Adds or removes `count` random interior cells, leaving the cells in `keep` free."""
+    for _ in range(count):
+        cell = (int(rng.integers(1, environment.width - 1)), int(rng.integers(1, environment.height - 3)))
+        if cell in keep or rng.random() < 0.5:
+            environment.remove_obstacle(*cell)
+        else:
+            environment.add_obstacle(*cell)
+
+
+class DStarLiteTests(PlannerTestCase):
+    def test_repairs_stay_optimal_after_edits_and_moves(self):
+        rng = np.random.default_rng(5)
+        for trial in range(4):
+            environment = random_environment(rng, 30, 26, 0.25)
+            start, goal = random_free_cell(rng, environment), random_free_cell(rng, environment)
+            environment.set_start(*start)
+            environment.set_goal(*goal)
+            planner = DStarLitePlanner()
+            resets = []
+            reset = planner.reset
+            planner.reset = lambda environment: resets.append(1) or reset(environment)
+            path, _ = planner.find_path(environment)
+
+            for replan in range(40):
+                with self.subTest(trial=trial, replan=replan):
+                    random_edits(rng, environment, int(rng.integers(1, 8)), keep=(start, goal))
+                    # Walk a few cells along the last path, as an agent following it would
+                    if path and len(path) > 1:
+                        start = tuple(path[min(int(rng.integers(1, 4)), len(path) - 1)])
+                        environment.remove_obstacle(*start)
+                        environment.set_start(*start)
+
+                    path, _ = planner.find_path(environment)
+                    distance = hop_distance(environment, start, goal)
+                    if distance is None:
+                        self.assertIsNone(path)
+                    else:
+                        self.assert_valid_path(environment, path, start, goal)
+                        self.assertEqual(len(path) - 1, distance)
+
+            # Only the first query searched from scratch; every later one was a repair
+            self.assertEqual(len(resets), 1)
+
+
+class HierarchicalRefreshTests(PlannerTestCase):
+    def test_refreshed_graph_matches_rebuilt_graph(self):
+        rng = np.random.default_rng(7)
+        for trial in range(4):
+            environment = random_environment(rng, 31, 27, 0.25)
+            planner = HierarchicalPlanner(cluster_size=6)
+            graph = planner.abstract_graph(environment)
+
+            for edit in range(25):
+                with self.subTest(trial=trial, edit=edit):
+                    random_edits(rng, environment, int(rng.integers(1, 8)))
+                    for _ in range(3):
+                        start, goal = random_free_cell(rng, environment), random_free_cell(rng, environment)
+                        environment.set_start(*start)
+                        environment.set_goal(*goal)
+                        path, _ = planner.find_path(environment)
+                        if hop_distance(environment, start, goal) is None:
+                            self.assertIsNone(path)
+                        else:
+                            self.assert_valid_path(environment, path, start, goal)
+
+                    # The edits only dirtied clusters, and patching them gives the graph a full rebuild would
+                    self.assertIs(planner.abstract_graph(environment), graph)
+                    rebuilt = Environment(environment.width, environment.height)
+                    rebuilt.occupancy[:] = environment.occupancy
+                    rebuilt.notify_changed()
+                    reference = AbstractGraph(rebuilt, graph.cluster_size)
+                    reference.refresh()
+                    self.assertEqual(graph.entrances, reference.entrances)
+                    self.assertEqual(graph.intra_edges, reference.intra_edges)
+
+
+def slab_ranges(environment, origin, directions, range_limit):
+    """Reference lidar scan: every beam against every obstacle square with the slab test."""
+    ys, xs = np.nonzero(environment.occupancy)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        near_x, far_x = ((xs[None, :] + side - origin[0]) / directions[:, :1] for side in (-0.5, 0.5))
+        near_y, far_y = ((ys[None, :] + side - origin[1]) / directions[:, 1:] for side in (-0.5, 0.5))
+    entry = np.maximum(np.maximum(np.minimum(near_x, far_x), np.minimum(near_y, far_y)), 0)
+    leave = np.minimum(np.maximum(near_x, far_x), np.maximum(near_y, far_y))
+    entry[(leave < entry) | (entry > range_limit)] = np.inf
+    nearest = entry.argmin(axis=1)
+    ranges = entry[np.arange(len(directions)), nearest]
+    hit_cells = np.where(np.isfinite(ranges)[:, None], np.column_stack((xs[nearest], ys[nearest])), -1)
+    return np.where(np.isfinite(ranges), ranges, range_limit), hit_cells
+
+
+class LidarSensorTests(unittest.TestCase):
+    def test_cast_matches_slab_reference(self):
+        rng = np.random.default_rng(3)
+        for trial in range(20):
+            environment = random_environment(rng, 24, 20, 0.15)
+            sensor = LidarSensor(range_limit=float(rng.uniform(3, 15)), beam_count=90,
+                                 angle_offset=float(rng.uniform(0, 2 * np.pi)))
+            for _ in range(5):
+                # Off-centre origins, anywhere inside the free cell
+                origin = np.add(random_free_cell(rng, environment), rng.uniform(-0.5, 0.5, 2))
+                with self.subTest(trial=trial, origin=origin.tolist()):
+                    ranges, hit_cells = sensor.cast(environment, origin)
+                    expected_ranges, expected_cells = slab_ranges(environment, origin, sensor.directions,
+                                                                  sensor.range_limit)
+                    np.testing.assert_allclose(ranges, expected_ranges, atol=1e-4)
+                    np.testing.assert_array_equal(hit_cells, expected_cells)
+
+    def test_origin_inside_an_obstacle(self):
+        environment = Environment(10, 10)
+        environment.add_obstacle(4, 4)
+        ranges, hit_cells = LidarSensor(beam_count=8).cast(environment, (4.2, 3.8))
+        np.testing.assert_array_equal(ranges, np.zeros(8))
+        np.testing.assert_array_equal(hit_cells, np.tile((4, 4), (8, 1)))
+
+
+class SenseManyTests(unittest.TestCase):
+    def test_batched_sensing_matches_generic_version(self):
+        rng = np.random.default_rng(9)
+        for trial in range(6):
+            environment = random_environment(rng, 28, 24, 0.2)
+            # Cell centres, off-centre points and points near or past the border of the grid
+            positions = np.concatenate((
+                [random_free_cell(rng, environment) for _ in range(30)],
+                rng.uniform(0, (environment.width - 1, environment.height - 1), (30, 2)),
+                rng.uniform(-3, (environment.width + 2, environment.height + 2), (10, 2))))
+            for sensor in (RangeSensor(range_limit=int(rng.integers(1, 7))),
+                           LidarSensor(range_limit=float(rng.uniform(3, 12)), beam_count=60)):
+                with self.subTest(trial=trial, sensor=str(sensor)):
+                    batch = sensor.sense_many(environment, positions)
+                    generic = SensorModel.sense_many(sensor, environment, positions)
+                    np.testing.assert_array_equal(batch["offsets"], generic["offsets"])
+                    np.testing.assert_array_equal(batch["obstacle_cells"], generic["obstacle_cells"])
+                    self.assertEqual(batch["obstacle_cells"].dtype, np.int32)
+                    if isinstance(sensor, LidarSensor):
+                        for i, sensor_data in enumerate(generic["readings"]):
+                            np.testing.assert_array_equal(batch["ranges"][i], sensor_data["ranges"])
+                            np.testing.assert_array_equal(batch["hit_cells"][i], sensor_data["hit_cells"])
+
+    def test_no_positions(self):
+        environment = Environment(10, 10)
+        for sensor in (RangeSensor(), LidarSensor()):
+            batch = sensor.sense_many(environment, np.zeros((0, 2)))
+            np.testing.assert_array_equal(batch["offsets"], [0])
+            self.assertEqual(batch["obstacle_cells"].shape, (0, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()